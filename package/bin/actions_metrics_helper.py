@@ -2,13 +2,13 @@ import json
 import logging
 
 import import_declare_test
-from solnlib import conf_manager, log
-from solnlib.conf_manager import InvalidHostnameError, InvalidPortError
+from solnlib import log
 from solnlib.modular_input import checkpointer
 from splunklib import modularinput as smi
 
 from datetime import datetime, timedelta, timezone
 from genesyscloud_client import GenesysCloudClient
+from genesyscloud_cache import ConfigCache, TokenCache
 
 ADDON_NAME = "genesys_cloud_ta"
 
@@ -16,16 +16,6 @@ def logger_for_input(input_name: str) -> logging.Logger:
     """Create and return a logger for the specified input."""
     return log.Logs().get_logger(f"{ADDON_NAME.lower()}_{input_name}")
 
-def get_account_property(session_key: str, account_name: str, property_name: str):
-    """Retrieve a specific property for a given Genesys Cloud account."""
-    cfm = conf_manager.ConfManager(
-        session_key,
-        ADDON_NAME,
-        realm=f"__REST_CREDENTIAL__#{ADDON_NAME}#configs/conf-genesys_cloud_ta_account",
-    )
-    account_conf_file = cfm.get_conf("genesys_cloud_ta_account")
-    return account_conf_file.get(account_name).get(property_name)
-
 def validate_input(definition: smi.ValidationDefinition):
     """Validation function for the modular input (currently unused)."""
     return
@@ -42,35 +32,23 @@ def stream_events(inputs: smi.InputDefinition, event_writer: smi.EventWriter):
                 "actions_metrics_checkpointer", session_key, ADDON_NAME
             )
 
-            log_level = conf_manager.get_log_level(
-                logger=logger, session_key=session_key,
-                app_name=ADDON_NAME, conf_name="genesys_cloud_ta_settings"
-            )
-            logger.setLevel(log_level)
-            try:
-                proxy_config = conf_manager.get_proxy_dict(
-                    logger=logger,
-                    session_key=session_key,
-                    app_name=ADDON_NAME,
-                    conf_name="genesys_cloud_ta_settings",
-                )
-            # Handle invalid port case
-            except InvalidPortError as e:
-                logger.error(f"Proxy configuration error: {e}")
-
-            # Handle invalid hostname case
-            except InvalidHostnameError as e:
-                logger.error(f"Proxy configuration error: {e}")
+            logger.setLevel(ConfigCache.get_log_level(logger, session_key))
+            proxy_config = ConfigCache.get_proxy_dict(logger, session_key)
             log.modular_input_start(logger, normalized_input_name)
 
             account = input_item.get("account")
             logger.info(f"Retrieving credentials for account: {account}")
 
-            account_region = get_account_property(session_key, account, "region")
-            client_id = get_account_property(session_key, account, "client_id")
-            client_secret = get_account_property(session_key, account, "client_secret")
+            account_config = ConfigCache.get_account(session_key, account)
+            account_region = account_config.get("region")
+            client_id = account_config.get("client_id")
+            client_secret = account_config.get("client_secret")
+            max_concurrency = account_config.get("max_concurrency")
 
-            client = GenesysCloudClient(logger, client_id, client_secret, account_region, proxy_config)
+            client = GenesysCloudClient(
+                logger, client_id, client_secret, account_region, proxy_config, max_concurrency,
+                token_cache=TokenCache(logger, session_key)
+            )
 
             checkpointer_key_name = normalized_input_name
             now = datetime.now(timezone.utc)
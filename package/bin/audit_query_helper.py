@@ -1,15 +1,15 @@
 import json
 import logging
-import time
 
 import import_declare_test
-from solnlib import conf_manager, log
-from solnlib.conf_manager import InvalidHostnameError, InvalidPortError
+from solnlib import log
+from solnlib.utils import is_true
 from solnlib.modular_input import checkpointer
 from splunklib import modularinput as smi
 
 from datetime import datetime, timedelta, timezone
-from genesyscloud_client import GenesysCloudClient
+from genesyscloud_client import GenesysCloudClient, JsonRecord
+from genesyscloud_cache import ConfigCache, TokenCache
 
 ADDON_NAME = "genesys_cloud_ta"
 
@@ -18,14 +18,18 @@ def logger_for_input(input_name: str) -> logging.Logger:
     return log.Logs().get_logger(f"{ADDON_NAME.lower()}_{input_name}")
 
 
-def get_account_property(session_key: str, account_name: str, property_name: str):
-    cfm = conf_manager.ConfManager(
-        session_key,
-        ADDON_NAME,
-        realm=f"__REST_CREDENTIAL__#{ADDON_NAME}#configs/conf-genesys_cloud_ta_account",
-    )
-    account_conf = cfm.get_conf("genesys_cloud_ta_account")
-    return account_conf.get(account_name).get(property_name)
+def parse_timestamp(value: str) -> datetime:
+    """
+    Parse a timestamp of a raw JSON response or of a downloaded file.
+    :param value: ISO8601 UTC timestamp, with or without milliseconds.
+    :return: Timezone aware datetime.
+    """
+    for fmt in ("%Y-%m-%dT%H:%M:%S.%fZ", "%Y-%m-%dT%H:%M:%SZ"):
+        try:
+            return datetime.strptime(value, fmt).replace(tzinfo=timezone.utc)
+        except ValueError:
+            continue
+    raise ValueError(f"Invalid timestamp: {value}")
 
 def exceed_range(start: str, end: str, max_days: int = 31,
                   fmt: str = "%Y-%m-%dT%H:%M:%SZ") -> bool:
@@ -67,34 +71,20 @@ def stream_events(inputs: smi.InputDefinition, event_writer: smi.EventWriter):
                 ADDON_NAME,
             )
 
-            log_level = conf_manager.get_log_level(
-                logger=logger,
-                session_key=session_key,
-                app_name=ADDON_NAME,
-                conf_name="genesys_cloud_ta_settings",
-            )
-            logger.setLevel(log_level)
-            try:
-                proxy_config = conf_manager.get_proxy_dict(
-                    logger=logger,
-                    session_key=session_key,
-                    app_name=ADDON_NAME,
-                    conf_name="genesys_cloud_ta_settings",
-                )
-            # Handle invalid port case
-            except InvalidPortError as e:
-                logger.error(f"Proxy configuration error: {e}")
-
-            # Handle invalid hostname case
-            except InvalidHostnameError as e:
-                logger.error(f"Proxy configuration error: {e}")
+            logger.setLevel(ConfigCache.get_log_level(logger, session_key))
+            proxy_config = ConfigCache.get_proxy_dict(logger, session_key)
             log.modular_input_start(logger, normalized_input_name)
 
-            account_region = get_account_property(session_key, input_item.get("account"), "region")
-            client_id = get_account_property(session_key, input_item.get("account"), "client_id")
-            client_secret = get_account_property(session_key, input_item.get("account"), "client_secret")
+            account_config = ConfigCache.get_account(session_key, input_item.get("account"))
+            account_region = account_config.get("region")
+            client_id = account_config.get("client_id")
+            client_secret = account_config.get("client_secret")
+            max_concurrency = account_config.get("max_concurrency")
 
-            client = GenesysCloudClient(logger, client_id, client_secret, account_region, proxy_config)
+            client = GenesysCloudClient(
+                logger, client_id, client_secret, account_region, proxy_config, max_concurrency,
+                token_cache=TokenCache(logger, session_key)
+            )
 
             checkpointer_key_name = normalized_input_name
 
@@ -138,18 +128,17 @@ def stream_events(inputs: smi.InputDefinition, event_writer: smi.EventWriter):
             max_polls = int(input_item.get("max_poll_attempts", "10"))
             poll_sleep = int(input_item.get("poll_interval_seconds", "2"))
 
-            status = ""
-            for _ in range(max_polls):
-                state_resp = client.get("AuditApi", "get_audits_query_transaction_id", transaction_id)
-                if not state_resp:
-                    raise Exception(f"Failed to get status for transaction {transaction_id}")
-                status = state_resp[0].state
-                # Allowed statuses:
-                # https://github.com/MyPureCloud/platform-client-sdk-python/blob/master/build/PureCloudPlatformClientV2/models/audit_query_execution_status_response.py#L126
-                if status in ("Succeeded", "Failed", "Cancelled"):
-                    logger.debug(f"Audit complete with status '{status}'")
-                    break
-                time.sleep(poll_sleep)
+            # Allowed statuses:
+            # https://github.com/MyPureCloud/platform-client-sdk-python/blob/master/build/PureCloudPlatformClientV2/models/audit_query_execution_status_response.py#L126
+            status = client.wait_for_job(
+                "AuditApi",
+                "get_audits_query_transaction_id",
+                transaction_id,
+                ("Succeeded", "Failed", "Cancelled"),
+                max_polls=max_polls,
+                poll_interval=poll_sleep
+            ).state
+            logger.debug(f"Audit status '{status}'")
 
             if status != "Succeeded":
                 raise Exception(f"Audit did not complete successfully: {status}")
@@ -160,25 +149,33 @@ def stream_events(inputs: smi.InputDefinition, event_writer: smi.EventWriter):
                 "page_size": 500
             }
 
-            results = client.get(
+            # Raw JSON skips the SDK models: events keep the API field names (camelCase)
+            # Records are streamed: those of a download URL file are written while it downloads.
+            # A failure stops the run before the checkpoint is updated.
+            results = client.iter_get(
                 "AuditApi",
                 "get_audits_query_transaction_id_results",
+                raw=is_true(input_item.get("raw_json")),
                 **params
             )
             event_counter = 0
             sourcetype="genesyscloud:operational:audits"
 
             for entity in results:
-                if not isinstance(entity, dict):
-                    value = entity.to_dict()
-                    time_value = entity.event_date.timestamp()
+                if isinstance(entity, JsonRecord):
+                    # Retrieved via download URL file: written as received, without being re-encoded
+                    data = entity
+                    time_value = parse_timestamp(entity.get("eventTime")).timestamp()
+                elif isinstance(entity, dict):
+                    # Retrieved as raw JSON
+                    data = json.dumps(entity, ensure_ascii=False, default=str)
+                    time_value = parse_timestamp(entity["eventDate"]).timestamp()
                 else:
-                    # Retrieved via download URL file
-                    value = entity
-                    time_value = datetime.strptime(entity["eventTime"], "%Y-%m-%dT%H:%M:%SZ").timestamp()
+                    data = json.dumps(entity.to_dict(), ensure_ascii=False, default=str)
+                    time_value = entity.event_date.timestamp()
                 event_writer.write_event(
                     smi.Event(
-                        data=json.dumps(value, ensure_ascii=False, default=str),
+                        data=data,
                         index=input_item.get("index"),
                         sourcetype=sourcetype,
                         time=time_value
@@ -1,30 +1,44 @@
 import json
 import logging
+import math
 
 import import_declare_test
-from solnlib import conf_manager, log
-from solnlib.conf_manager import InvalidHostnameError, InvalidPortError
+from solnlib import log
+from solnlib.utils import is_true
 from solnlib.modular_input import checkpointer
 from splunklib import modularinput as smi
 
 from datetime import datetime, timezone, timedelta
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional, Tuple
+from genesyscloud_backfill import (
+    BackfillCheckpoint, Window, format_interval, parse_interval, split_evenly, split_interval
+)
 from genesyscloud_client import GenesysCloudClient
+from genesyscloud_cache import ConfigCache, DedupStore, TokenCache
 
 
 ADDON_NAME = "genesys_cloud_ta"
+# Intervals longer than a slice are backfilled as windows collected in parallel
+BACKFILL_SLICE = timedelta(days=1)
+# Conversations targeted per window: slices are split according to their number of conversations
+BACKFILL_WINDOW_HITS = 2000
+BACKFILL_MIN_WINDOW = timedelta(minutes=1)
+# Async jobs: states after which a job no longer changes, and polling of its status.
+# Checks are spaced by a growing wait, about 20 minutes in total before giving up.
+JOB_DONE_STATES = ("FULFILLED", "FAILED", "CANCELLED", "EXPIRED")
+JOB_MAX_POLLS = 30
+JOB_POLL_INTERVAL = 2
+JOB_POLL_BACKOFF = 1.5
+# Jobs still running when polling gives up are resumed by the next runs, then abandoned once this old
+JOB_TIMEOUT = timedelta(hours=6)
+# Conversations started this long before the checkpoint are collected again, to catch the ones
+# still open at the last run. Those already written in their current state are skipped.
+DEFAULT_OVERLAP_MINUTES = 60
 
 def logger_for_input(input_name: str) -> logging.Logger:
     return log.Logs().get_logger(f"{ADDON_NAME.lower()}_{input_name}")
 
-def get_account_property(session_key: str, account_name: str, property_name: str):
-    cfm = conf_manager.ConfManager(
-        session_key,
-        ADDON_NAME,
-        realm=f"__REST_CREDENTIAL__#{ADDON_NAME}#configs/conf-genesys_cloud_ta_account",
-    )
-    account_conf_file = cfm.get_conf("genesys_cloud_ta_account")
-    return account_conf_file.get(account_name).get(property_name)
-
 def get_conversation_duration(start: datetime, end: datetime) -> int:
     """
     Calculate conversation duration.
@@ -37,6 +51,21 @@ def get_conversation_duration(start: datetime, end: datetime) -> int:
     duration = end - start
     return int(duration.total_seconds() * 1000)
 
+def parse_timestamp(value: str) -> datetime:
+    """
+    Parse a timestamp of a raw JSON response.
+    :param value: ISO8601 UTC timestamp, with or without milliseconds.
+    :return: Timezone aware datetime, or None if value is None.
+    """
+    if value is None:
+        return None
+    for fmt in ("%Y-%m-%dT%H:%M:%S.%fZ", "%Y-%m-%dT%H:%M:%SZ"):
+        try:
+            return datetime.strptime(value, fmt).replace(tzinfo=timezone.utc)
+        except ValueError:
+            continue
+    raise ValueError(f"Invalid timestamp: {value}")
+
 def exceed_range(start: str, end: str, max_days: int = 31,
                   fmt: str = "%Y-%m-%dT%H:%M:%SZ") -> bool:
     """Verify interval range does not exceed threshold.
@@ -54,6 +83,155 @@ def exceed_range(start: str, end: str, max_days: int = 31,
 
     return (end_dt - start_dt) >= timedelta(days=max_days)
 
+def conversation_data(event: dict, raw_json: bool) -> str:
+    """
+    Serialize a conversation, adding its duration in milliseconds.
+    :param event: Conversation, keyed by API field names if raw_json.
+    :param raw_json: The conversation was kept as raw JSON.
+    :return: Event data.
+    """
+    if raw_json:
+        event["conversationDuration"] = get_conversation_duration(
+            parse_timestamp(event.get("conversationStart")), parse_timestamp(event.get("conversationEnd"))
+        )
+    else:
+        event["conversation_duration"] = get_conversation_duration(event["conversation_start"], event["conversation_end"])
+    return json.dumps(event, ensure_ascii=False, default=str)
+
+def conversation_version(event: dict, raw_json: bool) -> Tuple[str, Optional[str]]:
+    """
+    Identify the state of a conversation, see DedupStore.
+    :param event: Conversation, keyed by API field names if raw_json.
+    :param raw_json: The conversation was kept as raw JSON.
+    :return: Tuple (conversation id, conversation end), the end being None while it is open.
+    """
+    if raw_json:
+        return event["conversationId"], event.get("conversationEnd")
+    end = event.get("conversation_end")
+    return event["conversation_id"], None if end is None else str(end)
+
+def conversation_start(event: dict, raw_json: bool) -> datetime:
+    """
+    :param event: Conversation, keyed by API field names if raw_json.
+    :param raw_json: The conversation was kept as raw JSON.
+    :return: Conversation start, timezone aware.
+    """
+    if raw_json:
+        return parse_timestamp(event["conversationStart"])
+    return event["conversation_start"]
+
+def pages(conversations: Iterable[dict], size: int) -> Iterator[List[dict]]:
+    """
+    Group streamed conversations back into pages.
+    :param conversations: Conversations.
+    :param size: Number of conversations per page.
+    :return: Iterator over lists of at most size conversations.
+    """
+    conversations = iter(conversations)
+    while True:
+        page = list(islice(conversations, size))
+        if not page:
+            return
+        yield page
+
+def write_conversations(event_writer: smi.EventWriter, input_item: dict, sourcetype: str,
+                        conversations: List[dict], raw_json: bool, dedup: DedupStore) -> int:
+    """
+    Write the conversations not written yet in their current state.
+    :param event_writer: Event writer.
+    :param input_item: Input configuration.
+    :param sourcetype: Sourcetype of the events.
+    :param conversations: Conversations, e.g. a page of results.
+    :param raw_json: The conversations were kept as raw JSON.
+    :param dedup: Versions of the conversations already written.
+    :return: Number of events written.
+    """
+    keys = [conversation_version(event, raw_json) for event in conversations]
+    versions = dict(keys)
+    changed = dedup.changed(versions)
+    event_counter = 0
+    for event, (conversation_id, _) in zip(conversations, keys):
+        if conversation_id not in changed:
+            continue
+        # A conversation is written once even if pages shifted while they were read
+        changed.discard(conversation_id)
+        event_writer.write_event(
+            smi.Event(
+                data=conversation_data(event, raw_json),
+                index=input_item.get("index"),
+                sourcetype=sourcetype
+            )
+        )
+        event_counter += 1
+    # Unchanged conversations are recorded again so that they stay among the most recently seen
+    dedup.add(versions)
+    return event_counter
+
+def plan_backfill(client: GenesysCloudClient, windows: List[Window]) -> List[Window]:
+    """
+    Split windows into smaller ones according to their number of conversations,
+    so that each of them holds about BACKFILL_WINDOW_HITS conversations.
+    :param client: Genesys Cloud client.
+    :param windows: Windows of at most BACKFILL_SLICE.
+    :return: Windows to be collected.
+    """
+    # Windows are counted concurrently
+    totals = client.post_totals(
+        "ConversationsApi",
+        "post_analytics_conversations_details_query",
+        "ConversationQuery",
+        ({"interval": format_interval(window)} for window in windows)
+    )
+    planned = []
+    for window, hits in zip(windows, totals):
+        planned.extend(split_evenly(window, math.ceil(hits / BACKFILL_WINDOW_HITS), BACKFILL_MIN_WINDOW))
+    return planned
+
+def submit_job(client: GenesysCloudClient, interval: str) -> str:
+    """
+    Submit an analytics conversation details job.
+    :param client: Genesys Cloud client.
+    :param interval: ISO8601 interval of the job.
+    :return: ID of the job.
+    """
+    response = client.post(
+        "ConversationsApi",
+        "post_analytics_conversations_details_jobs",
+        "AsyncConversationQuery",
+        {"interval": interval}
+    )
+    if not response:
+        raise Exception("No response was received from the conversation details job POST request.")
+    return response.job_id
+
+def delete_job(client: GenesysCloudClient, job_id: str) -> None:
+    """
+    Delete a job once its results are read or when it is abandoned. Failures are only logged,
+    as jobs expire on their own.
+    :param client: Genesys Cloud client.
+    :param job_id: ID of the job.
+    """
+    client.delete("ConversationsApi", "delete_analytics_conversations_details_job", job_id)
+
+def job_conversations(client: GenesysCloudClient, job_id: str, raw_json: bool) -> Iterator[dict]:
+    """
+    Stream the results of a fulfilled analytics conversation details job, page by page.
+    :param client: Genesys Cloud client.
+    :param job_id: ID of the job.
+    :param raw_json: Yield the conversations as raw JSON.
+    :return: Iterator over the conversations, as dictionaries.
+    """
+    # Results are paged by cursor
+    conversations = client.iter_get(
+        "ConversationsApi",
+        "get_analytics_conversations_details_job_results",
+        job_id,
+        raw=raw_json,
+        items_key="conversations"
+    )
+    for conversation in conversations:
+        yield conversation if raw_json else conversation.to_dict()
+
 def validate_input(definition: smi.ValidationDefinition):
     start_date = definition.parameters.get("start_date")
     fmt_str = "%Y-%m-%d"
@@ -73,32 +251,15 @@ def stream_events(inputs: smi.InputDefinition, event_writer: smi.EventWriter):
                 session_key,
                 ADDON_NAME,
             )
-            log_level = conf_manager.get_log_level(
-                logger=logger,
-                session_key=session_key,
-                app_name=ADDON_NAME,
-                conf_name="genesys_cloud_ta_settings",
-            )
-            logger.setLevel(log_level)
-            try:
-                proxy_config = conf_manager.get_proxy_dict(
-                    logger=logger,
-                    session_key=session_key,
-                    app_name=ADDON_NAME,
-                    conf_name="genesys_cloud_ta_settings",
-                )
-            # Handle invalid port case
-            except InvalidPortError as e:
-                logger.error(f"Proxy configuration error: {e}")
-
-            # Handle invalid hostname case
-            except InvalidHostnameError as e:
-                logger.error(f"Proxy configuration error: {e}")
+            logger.setLevel(ConfigCache.get_log_level(logger, session_key))
+            proxy_config = ConfigCache.get_proxy_dict(logger, session_key)
             log.modular_input_start(logger, normalized_input_name)
 
-            account_region = get_account_property(session_key, input_item.get("account"), "region")
-            client_id = get_account_property(session_key, input_item.get("account"), "client_id")
-            client_secret = get_account_property(session_key, input_item.get("account"), "client_secret")
+            account_config = ConfigCache.get_account(session_key, input_item.get("account"))
+            account_region = account_config.get("region")
+            client_id = account_config.get("client_id")
+            client_secret = account_config.get("client_secret")
+            max_concurrency = account_config.get("max_concurrency")
             # Setting a default start date of 7 days ago from now
             now = datetime.now(timezone.utc)
             fallback_start = (now - timedelta(days=7)).strftime("%Y-%m-%dT%H:%M:%SZ")
@@ -107,13 +268,19 @@ def stream_events(inputs: smi.InputDefinition, event_writer: smi.EventWriter):
                 fallback_start = datetime.strptime(start_date, "%Y-%m-%d").strftime("%Y-%m-%dT%H:%M:%SZ")
 
             client = GenesysCloudClient(
-                logger, client_id, client_secret, account_region, proxy_config
+                logger, client_id, client_secret, account_region, proxy_config, max_concurrency,
+                token_cache=TokenCache(logger, session_key)
             )
             checkpointer_key_name = normalized_input_name
 
-            # Retrieve the last checkpoint
-            start_time = kvstore_checkpointer.get(checkpointer_key_name)
+            # Retrieve the last checkpoint, the watermark up to which conversations were collected
+            checkpoint = kvstore_checkpointer.get(checkpointer_key_name)
+            start_time = checkpoint
             end_time = now.strftime("%Y-%m-%dT%H:%M:%SZ")
+            if checkpoint is not None:
+                overlap = timedelta(minutes=int(input_item.get("overlap_minutes") or DEFAULT_OVERLAP_MINUTES))
+                start_time = (parse_timestamp(checkpoint) - overlap).strftime("%Y-%m-%dT%H:%M:%SZ")
+            dedup = DedupStore(logger, normalized_input_name)
 
             # Evaluating the interval. It can be no greater than 31 days.
             # [400] BadRequest - You must specify a search interval as part of your query that does not exceed 31 days.
@@ -128,49 +295,147 @@ def stream_events(inputs: smi.InputDefinition, event_writer: smi.EventWriter):
 
             interval = f"{start_time}/{end_time}"
 
-            body = {
-                "interval": interval
-            }
-            logger.debug(f"Request body: {body}")
-
-            response = client.post(
-                "ConversationsApi",
-                "post_analytics_conversations_details_query",
-                "ConversationQuery",
-                body
-            )
-            # Careful: API call w/ paging! Needs conversion.
-            data = client.convert_response(response, "conversations")
+            # Raw JSON skips the SDK models: events keep the API field names (camelCase)
+            raw_json = is_true(input_item.get("raw_json"))
             sourcetype = "genesyscloud:analytics:conversations:details"
 
-            if data:
-                event_counter = 0
-                for event in data:
-                    # Adding conversation duration in milliseconds
-                    duration = get_conversation_duration(event["conversation_start"], event["conversation_end"])
-                    event["conversation_duration"] = duration
-                    event_writer.write_event(
-                        smi.Event(
-                            data=json.dumps(event, ensure_ascii=False, default=str),
-                            index=input_item.get("index"),
-                            sourcetype=sourcetype
-                        )
+            event_counter = 0
+            window = parse_interval(interval)
+            if is_true(input_item.get("async_job")):
+                # Bulk export. The pending job is saved so that the next run resumes polling it
+                # instead of submitting another one if it is still running when polling gives up.
+                job_key = f"{checkpointer_key_name}_job"
+                job = kvstore_checkpointer.get(job_key)
+                if job and now - parse_timestamp(job["submitted"]) > JOB_TIMEOUT:
+                    logger.warning(f"Abandoning job {job['id']} for {job['interval']}, submitted at {job['submitted']}")
+                    delete_job(client, job["id"])
+                    kvstore_checkpointer.delete(job_key)
+                    job = None
+                if job:
+                    logger.info(f"Resuming job {job['id']} for {job['interval']}")
+                    window = parse_interval(job["interval"])
+                else:
+                    # Jobs only cover the conversations up to the date their data is available
+                    availability = client.get("ConversationsApi", "get_analytics_conversations_details_jobs_availability")
+                    if availability and availability[0].data_availability_date:
+                        window = (window[0], min(window[1], availability[0].data_availability_date.replace(microsecond=0)))
+                    if window[1] <= window[0]:
+                        logger.info(f"No data available for jobs after {start_time} yet")
+                    else:
+                        interval = format_interval(window)
+                        logger.debug(f"Submitting job for {interval}")
+                        job = {
+                            "id": submit_job(client, interval),
+                            "interval": interval,
+                            "submitted": now.strftime("%Y-%m-%dT%H:%M:%SZ")
+                        }
+                        kvstore_checkpointer.update(job_key, job)
+
+                if job:
+                    status = client.wait_for_job(
+                        "ConversationsApi",
+                        "get_analytics_conversations_details_job",
+                        job["id"],
+                        JOB_DONE_STATES,
+                        max_polls=JOB_MAX_POLLS,
+                        poll_interval=JOB_POLL_INTERVAL,
+                        backoff=JOB_POLL_BACKOFF
                     )
-                    event_counter += 1
+                    if status.state == "FULFILLED":
+                        end_time = window[1].strftime("%Y-%m-%dT%H:%M:%SZ")
+                        collected = False
+                        for page in pages(job_conversations(client, job["id"], raw_json), client.POST_PAGE_SIZE):
+                            event_counter += write_conversations(
+                                event_writer, input_item, sourcetype, page, raw_json, dedup
+                            )
+                            collected = True
+
+                        if collected:
+                            logger.debug(f"Indexed '{event_counter}' events")
+                            logger.debug(f"Updating checkpointer to {end_time}")
+                            kvstore_checkpointer.update(checkpointer_key_name, end_time)
+                        delete_job(client, job["id"])
+                        kvstore_checkpointer.delete(job_key)
+                    elif status.state in JOB_DONE_STATES:
+                        delete_job(client, job["id"])
+                        kvstore_checkpointer.delete(job_key)
+                        raise Exception(f"Conversation details job {job['id']} did not complete successfully: {status.state} {status.error_message or ''}")
+                    else:
+                        logger.info(f"Job {job['id']} is still {status.state}, polling resumes on the next run")
+            elif window[1] - window[0] > BACKFILL_SLICE:
+                # Backfill: windows sized by their number of conversations are collected in parallel,
+                # and checkpointed one by one so that an interrupted backfill resumes where it stopped
+                backfill = BackfillCheckpoint(
+                    logger, kvstore_checkpointer, f"{checkpointer_key_name}_backfill", window
+                )
+                windows = plan_backfill(client, backfill.remaining(split_interval(backfill.window, BACKFILL_SLICE)))
+                logger.info(f"Backfilling {format_interval(backfill.window)} in {len(windows)} windows")
+                results = client.iter_post_many(
+                    "ConversationsApi",
+                    "post_analytics_conversations_details_query",
+                    "ConversationQuery",
+                    ((w, {"interval": format_interval(w)}) for w in windows),
+                    "conversations",
+                    raw=raw_json
+                )
+                for collected_window, conversations in results:
+                    event_counter += write_conversations(
+                        event_writer, input_item, sourcetype, conversations, raw_json, dedup
+                    )
+                    backfill.complete(collected_window)
+                    logger.debug(f"Collected window {format_interval(collected_window)}: {len(conversations)} conversations")
+
+                # The checkpoint moves to the end of the backfilled interval even without new
+                # conversations, as its windows were collected over several runs
+                end_time = backfill.window[1].strftime("%Y-%m-%dT%H:%M:%SZ")
+                logger.debug(f"Indexed '{event_counter}' events")
+                logger.debug(f"Updating checkpointer to {end_time}")
+                kvstore_checkpointer.update(checkpointer_key_name, end_time)
+                backfill.finish()
+            else:
+                body = {
+                    "interval": interval,
+                    "order": "asc",
+                    "order_by": "conversationStart"
+                }
+                logger.debug(f"Request body: {body}")
 
-                if event_counter > 0:
+                # Careful: API call w/ paging! Conversations are streamed one page at a time.
+                data = client.iter_post(
+                    "ConversationsApi",
+                    "post_analytics_conversations_details_query",
+                    "ConversationQuery",
+                    body,
+                    "conversations",
+                    raw=raw_json
+                )
+                collected = False
+                for page in pages(data, client.POST_PAGE_SIZE):
+                    event_counter += write_conversations(
+                        event_writer, input_item, sourcetype, page, raw_json, dedup
+                    )
+                    collected = True
+                    # Conversations come by start: every conversation started before the last one of the
+                    # page is collected. The watermark advances so that a failed run resumes from there.
+                    watermark = conversation_start(page[-1], raw_json).strftime("%Y-%m-%dT%H:%M:%SZ")
+                    if checkpoint is None or watermark > checkpoint:
+                        checkpoint = watermark
+                        kvstore_checkpointer.update(checkpointer_key_name, checkpoint)
+
+                if collected:
                     logger.debug(f"Indexed '{event_counter}' events")
                     logger.debug(f"Updating checkpointer to {end_time}")
                     kvstore_checkpointer.update(checkpointer_key_name, end_time)
 
-                log.events_ingested(
-                    logger,
-                    input_name,
-                    sourcetype,
-                    event_counter,
-                    input_item.get("index"),
-                    account=input_item.get("account"),
-                )
+            dedup.prune()
+            log.events_ingested(
+                logger,
+                input_name,
+                sourcetype,
+                event_counter,
+                input_item.get("index"),
+                account=input_item.get("account"),
+            )
 
             log.modular_input_end(logger, normalized_input_name)
         except Exception as e:
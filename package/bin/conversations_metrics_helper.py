@@ -2,34 +2,80 @@ import json
 import logging
 
 import import_declare_test
-from solnlib import conf_manager, log
-from solnlib.conf_manager import InvalidHostnameError, InvalidPortError
+from solnlib import log
 from solnlib.modular_input import checkpointer
 from splunklib import modularinput as smi
 
 from datetime import datetime, timezone
+from typing import Iterator, List, Tuple
 from genesyscloud_client import GenesysCloudClient
+from genesyscloud_cache import ConfigCache, ResponseCache, TokenCache
+from genesyscloud_models import QueueModel
 
 ADDON_NAME = "genesys_cloud_ta"
+METRICS = [
+    "nBlindTransferred", "nBotInteractions", "nCobrowseSessions", "nConnected",
+    "nConsult", "nConsultTransferred", "nError", "nOffered", "nOutbound",
+    "nOutboundAbandoned", "nOutboundAttempted", "nOutboundConnected", "nOverSla",
+    "nStateTransitionError", "nTransferred", "oExternalMediaCount", "oMediaCount",
+    "oMessageTurn", "oServiceLevel", "oServiceTarget",
+    "tWait", "tAbandon", "tAcd", "tActiveCallback", "tActiveCallbackComplete",
+    "tAcw", "tAgentResponseTime", "tAlert", "tAnswered", "tBarging", "tCoaching",
+    "tCoachingComplete", "tConnected", "tContacting", "tDialing", "tFirstConnect",
+    "tFirstDial", "tFlowOut", "tHandle", "tHeld", "tHeldComplete", "tIvr",
+    "tMonitoring", "tMonitoringComplete", "tNotResponding", "tPark", "tParkComplete",
+    "tShortAbandon", "tTalk", "tTalkComplete", "tUserResponseTime", "tVoicemail"
+]
 
 def logger_for_input(input_name: str) -> logging.Logger:
     """Create and return a logger for the specified input."""
     return log.Logs().get_logger(f"{ADDON_NAME.lower()}_{input_name}")
 
-def get_account_property(session_key: str, account_name: str, property_name: str):
-    """Retrieve a specific property for a given Genesys Cloud account."""
-    cfm = conf_manager.ConfManager(
-        session_key,
-        ADDON_NAME,
-        realm=f"__REST_CREDENTIAL__#{ADDON_NAME}#configs/conf-genesys_cloud_ta_account",
-    )
-    account_conf_file = cfm.get_conf("genesys_cloud_ta_account")
-    return account_conf_file.get(account_name).get(property_name)
-
 def validate_input(definition: smi.ValidationDefinition):
     """Validation function for the modular input (currently unused)."""
     return
 
+def metric_families(metrics: List[str]) -> List[List[str]]:
+    """Group metrics by family, i.e. their prefix: counts (n), observations (o) and timers (t)."""
+    families = {}
+    for metric in metrics:
+        families.setdefault(metric[0], []).append(metric)
+    return list(families.values())
+
+def plan_shards(queue_model: QueueModel, interval: str, filter_block: dict) -> Iterator[Tuple[tuple, dict]]:
+    """
+    Shard the aggregates query by set of queues and metric family, so that the size of each
+    response is bounded whatever the number of queues.
+    Conversations without queue, included when grouping by queueId, make a shard of their own.
+    :param queue_model: Queues of the organization, listed at the time of the run.
+    :param interval: ISO8601 interval of the query.
+    :param filter_block: Filter of the input, e.g. media types and directions.
+    :return: Iterator over tuples (tag, query body), the tag being (queue set number, metric family).
+    """
+    queue_predicates = []
+    cnt = 0
+    has_more = True
+    while has_more:
+        queue_ids, has_more = queue_model.get_queue_ids(cnt)
+        if queue_ids:
+            queue_predicates.append([
+                {"dimension": "queueId", "operator": "matches", "value": queue_id} for queue_id in queue_ids
+            ])
+        cnt += 1
+    queue_predicates.append([{"dimension": "queueId", "operator": "notExists"}])
+
+    for number, predicates in enumerate(queue_predicates):
+        for family in metric_families(METRICS):
+            yield (number, family[0][0]), {
+                "interval": interval,
+                "metrics": family,
+                "group_by": ["queueId"],
+                "filter": {
+                    "type": "and",
+                    "clauses": filter_block["clauses"] + [{"type": "or", "predicates": predicates}]
+                }
+            }
+
 def stream_events(inputs: smi.InputDefinition, event_writer: smi.EventWriter):
     for input_name, input_item in inputs.inputs.items():
         normalized_input_name = input_name.split("/")[-1]
@@ -43,33 +89,20 @@ def stream_events(inputs: smi.InputDefinition, event_writer: smi.EventWriter):
                 ADDON_NAME,
             )
 
-            log_level = conf_manager.get_log_level(
-                logger=logger,
-                session_key=session_key,
-                app_name=ADDON_NAME,
-                conf_name="genesys_cloud_ta_settings",
-            )
-            logger.setLevel(log_level)
-            try:
-                proxy_config = conf_manager.get_proxy_dict(
-                    logger=logger,
-                    session_key=session_key,
-                    app_name=ADDON_NAME,
-                    conf_name="genesys_cloud_ta_settings",
-                )
-            # Handle invalid port case
-            except InvalidPortError as e:
-                logger.error(f"Proxy configuration error: {e}")
-
-            # Handle invalid hostname case
-            except InvalidHostnameError as e:
-                logger.error(f"Proxy configuration error: {e}")
+            logger.setLevel(ConfigCache.get_log_level(logger, session_key))
+            proxy_config = ConfigCache.get_proxy_dict(logger, session_key)
             log.modular_input_start(logger, normalized_input_name)
 
-            account_region = get_account_property(session_key, input_item.get("account"), "region")
-            client_id = get_account_property(session_key, input_item.get("account"), "client_id")
-            client_secret = get_account_property(session_key, input_item.get("account"), "client_secret")
-            client = GenesysCloudClient(logger, client_id, client_secret, account_region, proxy_config)
+            account_config = ConfigCache.get_account(session_key, input_item.get("account"))
+            account_region = account_config.get("region")
+            client_id = account_config.get("client_id")
+            client_secret = account_config.get("client_secret")
+            max_concurrency = account_config.get("max_concurrency")
+            client = GenesysCloudClient(
+                logger, client_id, client_secret, account_region, proxy_config, max_concurrency,
+                token_cache=TokenCache(logger, session_key),
+                response_cache=ResponseCache(logger)
+            )
 
             checkpointer_key_name = normalized_input_name
             current_checkpoint = (
@@ -81,21 +114,6 @@ def stream_events(inputs: smi.InputDefinition, event_writer: smi.EventWriter):
             now = datetime.now(timezone.utc)
             interval = f"{start_time.strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3]}Z/{now.strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3]}Z"
 
-            metrics = [
-                "nBlindTransferred", "nBotInteractions", "nCobrowseSessions", "nConnected",
-                "nConsult", "nConsultTransferred", "nError", "nOffered", "nOutbound",
-                "nOutboundAbandoned", "nOutboundAttempted", "nOutboundConnected", "nOverSla",
-                "nStateTransitionError", "nTransferred", "oExternalMediaCount", "oMediaCount",
-                "oMessageTurn", "oServiceLevel", "oServiceTarget",
-                "tWait", "tAbandon", "tAcd", "tActiveCallback", "tActiveCallbackComplete",
-                "tAcw", "tAgentResponseTime", "tAlert", "tAnswered", "tBarging", "tCoaching",
-                "tCoachingComplete", "tConnected", "tContacting", "tDialing", "tFirstConnect",
-                "tFirstDial", "tFlowOut", "tHandle", "tHeld", "tHeldComplete", "tIvr",
-                "tMonitoring", "tMonitoringComplete", "tNotResponding", "tPark", "tParkComplete",
-                "tShortAbandon", "tTalk", "tTalkComplete", "tUserResponseTime", "tVoicemail"
-            ]
-            group_by = ["queueId"]
-
             media_types_raw = input_item.get("media_types", "")
             directions_raw = input_item.get("direction", "")
             media_types = media_types_raw.split("|") if media_types_raw else []
@@ -110,24 +128,23 @@ def stream_events(inputs: smi.InputDefinition, event_writer: smi.EventWriter):
             if direction_predicates:
                 filter_block["clauses"].append({"type": "or", "predicates": direction_predicates})
 
-            body = {
-                "interval": interval,
-                "metrics": metrics,
-                "group_by": group_by,
-                "filter": filter_block
-            }
+            # Queues are listed live rather than from the inventory cache, so that the conversations
+            # of queues created since the last snapshot are not left out of the shards
+            logger.info("Getting data from queues endpoint")
+            queue_model = QueueModel(client.iter_get("RoutingApi", "get_routing_queues"))
 
+            # Shards are queried concurrently and written as soon as each of them returns
             sourcetype = "genesyscloud:analytics:flows:metrics"
-            response = client.post(
+            results = client.iter_post_many(
                 "ConversationsApi",
                 "post_analytics_conversations_aggregates_query",
                 "ConversationAggregationQuery",
-                body
+                plan_shards(queue_model, interval, filter_block),
+                "results"
             )
-            if response:
-                event_counter = 0
-                res_dict = response.to_dict() or {}
-                to_process_data = res_dict.get("results") or []
+            event_counter = 0
+            for tag, to_process_data in results:
+                logger.debug(f"Fetched {len(to_process_data)} results of shard {tag}")
                 for event in to_process_data:
                     try:
                         for data_entry in event["data"]:
@@ -150,20 +167,20 @@ def stream_events(inputs: smi.InputDefinition, event_writer: smi.EventWriter):
                     except Exception as e:
                         logger.error(f"Failed to write event. Error: {str(e)}")
 
-                if event_counter > 0:
-                    logger.debug(f"Indexed '{event_counter}' events")
-                    new_checkpoint = now.timestamp()
-                    logger.debug(f"Updating checkpointer to {new_checkpoint}")
-                    kvstore_checkpointer.update(checkpointer_key_name, new_checkpoint)
-
-                log.events_ingested(
-                    logger,
-                    input_name,
-                    sourcetype,
-                    event_counter,
-                    input_item.get("index"),
-                    account=input_item.get("account"),
-                )
+            if event_counter > 0:
+                logger.debug(f"Indexed '{event_counter}' events")
+                new_checkpoint = now.timestamp()
+                logger.debug(f"Updating checkpointer to {new_checkpoint}")
+                kvstore_checkpointer.update(checkpointer_key_name, new_checkpoint)
+
+            log.events_ingested(
+                logger,
+                input_name,
+                sourcetype,
+                event_counter,
+                input_item.get("index"),
+                account=input_item.get("account"),
+            )
 
             log.modular_input_end(logger, normalized_input_name)
 
@@ -3,13 +3,13 @@ import json
 import logging
 
 import import_declare_test
-from solnlib import conf_manager, log
-from solnlib.conf_manager import InvalidHostnameError, InvalidPortError
+from solnlib import log
 from solnlib.modular_input import checkpointer
 from splunklib import modularinput as smi
 
 from datetime import datetime, timezone
 from genesyscloud_client import GenesysCloudClient
+from genesyscloud_cache import ConfigCache, ResponseCache, TokenCache
 from genesyscloud_models import EdgeModel
 
 
@@ -19,16 +19,6 @@ def logger_for_input(input_name: str) -> logging.Logger:
     return log.Logs().get_logger(f"{ADDON_NAME.lower()}_{input_name}")
 
 
-def get_account_property(session_key: str, account_name: str, property_name: str):
-    cfm = conf_manager.ConfManager(
-        session_key,
-        ADDON_NAME,
-        realm=f"__REST_CREDENTIAL__#{ADDON_NAME}#configs/conf-genesys_cloud_ta_account",
-    )
-    account_conf_file = cfm.get_conf("genesys_cloud_ta_account")
-    return account_conf_file.get(account_name).get(property_name)
-
-
 def validate_input(definition: smi.ValidationDefinition):
     return
 
@@ -55,36 +45,21 @@ def stream_events(inputs: smi.InputDefinition, event_writer: smi.EventWriter):
                 session_key,
                 ADDON_NAME,
             )
-            log_level = conf_manager.get_log_level(
-                logger=logger,
-                session_key=session_key,
-                app_name=ADDON_NAME,
-                conf_name="genesys_cloud_ta_settings",
-            )
-            logger.setLevel(log_level)
-            try:
-                proxy_config = conf_manager.get_proxy_dict(
-                    logger=logger,
-                    session_key=session_key,
-                    app_name=ADDON_NAME,
-                    conf_name="genesys_cloud_ta_settings",
-                )
-            # Handle invalid port case
-            except InvalidPortError as e:
-                logger.error(f"Proxy configuration error: {e}")
-
-            # Handle invalid hostname case
-            except InvalidHostnameError as e:
-                logger.error(f"Proxy configuration error: {e}")
+            logger.setLevel(ConfigCache.get_log_level(logger, session_key))
+            proxy_config = ConfigCache.get_proxy_dict(logger, session_key)
             log.modular_input_start(logger, normalized_input_name)
 
-            account_region = get_account_property(session_key, input_item.get("account"), "region")
-            client_id = get_account_property(session_key, input_item.get("account"), "client_id")
-            client_secret = get_account_property(session_key, input_item.get("account"), "client_secret")
+            account_config = ConfigCache.get_account(session_key, input_item.get("account"))
+            account_region = account_config.get("region")
+            client_id = account_config.get("client_id")
+            client_secret = account_config.get("client_secret")
+            max_concurrency = account_config.get("max_concurrency")
             # aws_region = input_item.get('region')
 
             client = GenesysCloudClient(
-                logger, client_id, client_secret, account_region, proxy_config
+                logger, client_id, client_secret, account_region, proxy_config, max_concurrency,
+                token_cache=TokenCache(logger, session_key),
+                response_cache=ResponseCache(logger)
             )
 
             checkpointer_key_name = input_name.split("/")[-1]
@@ -94,41 +69,44 @@ def stream_events(inputs: smi.InputDefinition, event_writer: smi.EventWriter):
                 or datetime(1970, 1, 1).timestamp()
             )
 
-            e_model = EdgeModel(client.get(
+            e_model = EdgeModel(client.iter_get(
                 "TelephonyProvidersEdgeApi", "get_telephony_providers_edges")
             )
 
             # Max 100 edgeids supported according to specs
-            metrics = []
+            batches = []
             cnt = 0
             has_more = True
             while has_more:
                 edges_ids, has_more = e_model.get_edge_ids(cnt)
-                data = client.get(
-                    "TelephonyProvidersEdgeApi",
-                    "get_telephony_providers_edges_metrics",
-                    ','.join(edges_ids)
-                )
-                metrics.extend(data)
-                cnt+=1
-            logger.debug(f"Fetched '{len(metrics)}' metrics")
+                batches.append((','.join(edges_ids),))
+                cnt += 1
 
+            # Batches are requested concurrently and their metrics written as they arrive
             sourcetype = "genesyscloud:telephonyprovidersedge:edges:metrics"
+            metric_counter = 0
             event_counter = 0
-            for metric_obj in metrics:
-                event_time_epoch = metric_obj.event_time.timestamp()
-                metric = metric_obj.to_dict()
-                metric["event_time"] = e_model.to_string(metric_obj.event_time)
-                metric["edge"] = e_model.get_edge(metric_obj.edge.id)
-                if event_time_epoch > current_checkpoint:
-                    event_writer.write_event(
-                        smi.Event(
-                            data=json.dumps(metric, ensure_ascii=False, default=str),
-                            index=input_item.get("index"),
-                            sourcetype=sourcetype,
+            for data in client.get_many(
+                "TelephonyProvidersEdgeApi",
+                "get_telephony_providers_edges_metrics",
+                batches
+            ):
+                metric_counter += len(data)
+                for metric_obj in data:
+                    event_time_epoch = metric_obj.event_time.timestamp()
+                    metric = metric_obj.to_dict()
+                    metric["event_time"] = e_model.to_string(metric_obj.event_time)
+                    metric["edge"] = e_model.get_edge(metric_obj.edge.id)
+                    if event_time_epoch > current_checkpoint:
+                        event_writer.write_event(
+                            smi.Event(
+                                data=json.dumps(metric, ensure_ascii=False, default=str),
+                                index=input_item.get("index"),
+                                sourcetype=sourcetype,
+                            )
                         )
-                    )
-                    event_counter += 1
+                        event_counter += 1
+            logger.debug(f"Fetched '{metric_counter}' metrics")
 
             # Updating checkpoint if data was indexed to avoid losing info
             if event_counter > 0:
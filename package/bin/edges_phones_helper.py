@@ -3,13 +3,13 @@ import json
 import logging
 
 import import_declare_test
-from solnlib import conf_manager, log
-from solnlib.conf_manager import InvalidHostnameError, InvalidPortError
+from solnlib import log
 from solnlib.modular_input import checkpointer
 from splunklib import modularinput as smi
 
 from datetime import datetime, timezone
 from genesyscloud_client import GenesysCloudClient
+from genesyscloud_cache import ConfigCache, TokenCache
 from genesyscloud_models import PhoneModel
 
 
@@ -19,16 +19,6 @@ def logger_for_input(input_name: str) -> logging.Logger:
     return log.Logs().get_logger(f"{ADDON_NAME.lower()}_{input_name}")
 
 
-def get_account_property(session_key: str, account_name: str, property_name: str):
-    cfm = conf_manager.ConfManager(
-        session_key,
-        ADDON_NAME,
-        realm=f"__REST_CREDENTIAL__#{ADDON_NAME}#configs/conf-genesys_cloud_ta_account",
-    )
-    account_conf_file = cfm.get_conf("genesys_cloud_ta_account")
-    return account_conf_file.get(account_name).get(property_name)
-
-
 def validate_input(definition: smi.ValidationDefinition):
     return
 
@@ -55,35 +45,19 @@ def stream_events(inputs: smi.InputDefinition, event_writer: smi.EventWriter):
                 session_key,
                 ADDON_NAME,
             )
-            log_level = conf_manager.get_log_level(
-                logger=logger,
-                session_key=session_key,
-                app_name=ADDON_NAME,
-                conf_name="genesys_cloud_ta_settings",
-            )
-            logger.setLevel(log_level)
-            try:
-                proxy_config = conf_manager.get_proxy_dict(
-                    logger=logger,
-                    session_key=session_key,
-                    app_name=ADDON_NAME,
-                    conf_name="genesys_cloud_ta_settings",
-                )
-            # Handle invalid port case
-            except InvalidPortError as e:
-                logger.error(f"Proxy configuration error: {e}")
-
-            # Handle invalid hostname case
-            except InvalidHostnameError as e:
-                logger.error(f"Proxy configuration error: {e}")
+            logger.setLevel(ConfigCache.get_log_level(logger, session_key))
+            proxy_config = ConfigCache.get_proxy_dict(logger, session_key)
             log.modular_input_start(logger, normalized_input_name)
 
-            account_region = get_account_property(session_key, input_item.get("account"), "region")
-            client_id = get_account_property(session_key, input_item.get("account"), "client_id")
-            client_secret = get_account_property(session_key, input_item.get("account"), "client_secret")
+            account_config = ConfigCache.get_account(session_key, input_item.get("account"))
+            account_region = account_config.get("region")
+            client_id = account_config.get("client_id")
+            client_secret = account_config.get("client_secret")
+            max_concurrency = account_config.get("max_concurrency")
 
             client = GenesysCloudClient(
-                logger, client_id, client_secret, account_region, proxy_config
+                logger, client_id, client_secret, account_region, proxy_config, max_concurrency,
+                token_cache=TokenCache(logger, session_key)
             )
 
             checkpointer_key_name = input_name.split("/")[-1]
@@ -93,32 +67,37 @@ def stream_events(inputs: smi.InputDefinition, event_writer: smi.EventWriter):
                 or datetime(1970, 1, 1).timestamp()
             )
 
-            p_model = PhoneModel(
-                client.get(
-                    "TelephonyProvidersEdgeApi",
-                    "get_telephony_providers_edges_phones",
-                    **{"expand":"site,status"}
-                )
+            # Phones are streamed page by page, so events are written while
+            # the next page is still being fetched
+            phones = client.iter_get(
+                "TelephonyProvidersEdgeApi",
+                "get_telephony_providers_edges_phones",
+                **{"expand":"site,status"}
             )
             # Max 10k results returned when filtering the results or sorting
             # by a field other than the ID
-            statuses = p_model.extended_statuses
-            logger.debug(f"Fetched '{len(statuses)}' phone statuses")
-
             sourcetype = "genesyscloud:telephonyprovidersedge:edges:phones"
+            # Only the statuses whose state changed since the previous run are
+            # serialized and written, according to the digests of that run
+            digests_key_name = f"{checkpointer_key_name}_digests"
+            previous_digests = kvstore_checkpointer.get(digests_key_name) or {}
+            current_digests = {}
             event_counter = 0
-            for status_obj in statuses:
-                event_time_epoch = p_model.to_datetime(status_obj["event_creation_time"]).timestamp()
-                if event_time_epoch > current_checkpoint:
-                    event_writer.write_event(
-                        smi.Event(
-                            data=json.dumps(status_obj, ensure_ascii=False, default=str),
-                            time=event_time_epoch,
-                            index=input_item.get("index"),
-                            sourcetype=sourcetype,
-                        )
+            for status_obj in PhoneModel.iter_changed_statuses(
+                phones, previous_digests, current_digests, current_checkpoint
+            ):
+                event_time_epoch = PhoneModel.to_datetime(status_obj["event_creation_time"]).timestamp()
+                event_writer.write_event(
+                    smi.Event(
+                        data=json.dumps(status_obj, ensure_ascii=False, default=str),
+                        time=event_time_epoch,
+                        index=input_item.get("index"),
+                        sourcetype=sourcetype,
                     )
-                    event_counter += 1
+                )
+                event_counter += 1
+            logger.debug(f"Fetched '{len(current_digests)}' phones")
+            kvstore_checkpointer.update(digests_key_name, current_digests)
 
             # Updating checkpoint if data was indexed to avoid losing info
             if event_counter > 0:
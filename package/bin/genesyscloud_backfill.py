@@ -0,0 +1,179 @@
+import logging
+import math
+
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, List, Tuple
+
+INTERVAL_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+Window = Tuple[datetime, datetime]
+
+
+def format_interval(window: Window) -> str:
+    """
+    Format a window as an ISO8601 interval.
+    :param window: Tuple (start, end).
+    :return: Interval, e.g. 2025-01-01T00:00:00Z/2025-01-02T00:00:00Z.
+    """
+    return f"{window[0].strftime(INTERVAL_FORMAT)}/{window[1].strftime(INTERVAL_FORMAT)}"
+
+
+def parse_interval(interval: str) -> Window:
+    """
+    Parse an ISO8601 interval, see format_interval.
+    :param interval: Interval.
+    :return: Tuple (start, end) of timezone aware datetimes.
+    """
+    start, end = interval.split("/")
+    return (
+        datetime.strptime(start, INTERVAL_FORMAT).replace(tzinfo=timezone.utc),
+        datetime.strptime(end, INTERVAL_FORMAT).replace(tzinfo=timezone.utc),
+    )
+
+
+def split_interval(window: Window, step: timedelta) -> List[Window]:
+    """
+    Split a window into consecutive windows of step, the last one being shorter if needed.
+    :param window: Tuple (start, end).
+    :param step: Duration of the windows.
+    :return: List of windows covering the given one.
+    """
+    windows = []
+    start, end = window
+    while start < end:
+        windows.append((start, min(start + step, end)))
+        start += step
+    return windows
+
+
+def split_evenly(window: Window, parts: int, min_duration: timedelta = timedelta(seconds=1)) -> List[Window]:
+    """
+    Split a window into windows of equal duration, whole seconds as the intervals of the API.
+    :param window: Tuple (start, end).
+    :param parts: Number of windows.
+    :param min_duration: Windows are not made shorter than this.
+    :return: List of windows covering the given one.
+    """
+    duration = window[1] - window[0]
+    parts = max(1, min(parts, int(duration / min_duration)))
+    step = timedelta(seconds=math.ceil(duration.total_seconds() / parts))
+    return split_interval(window, step)
+
+
+def split_days(window: Window, days: int) -> List[Window]:
+    """
+    Split a window at UTC midnights, into windows of at most days whole days.
+    A partial first or last day is a window of its own.
+    :param window: Tuple (start, end).
+    :param days: Number of days of the windows of whole days.
+    :return: List of windows covering the given one.
+    """
+    start, end = window
+    first = start.replace(hour=0, minute=0, second=0, microsecond=0)
+    if first < start:
+        first += timedelta(days=1)
+    last = end.replace(hour=0, minute=0, second=0, microsecond=0)
+    boundaries = [start]
+    if first <= last:
+        boundaries.extend(w[0] for w in split_interval((first, last), timedelta(days=days)))
+        boundaries.append(last)
+    boundaries.append(end)
+    # Boundaries falling on the ends of the window do not cut it
+    boundaries = sorted(set(boundaries))
+    return list(zip(boundaries, boundaries[1:]))
+
+
+def subtract(windows: Iterable[Window], done: Iterable[Window]) -> List[Window]:
+    """
+    Remove the parts of windows already covered.
+    :param windows: Windows to be collected.
+    :param done: Windows already collected.
+    :return: Remaining windows, in order.
+    """
+    done = sorted(done)
+    remaining = []
+    for start, end in windows:
+        for done_start, done_end in done:
+            if done_end <= start or done_start >= end:
+                continue
+            if done_start > start:
+                remaining.append((start, done_start))
+            start = max(start, done_end)
+            if start >= end:
+                break
+        if start < end:
+            remaining.append((start, end))
+    return remaining
+
+
+class BackfillCheckpoint:
+    """
+    Progress of an interval collected as several windows, stored in a KVStoreCheckpointer.
+    Windows are recorded as they complete, in any order, so that an interrupted backfill
+    resumes with the windows not collected yet instead of starting over.
+    """
+    def __init__(self, logger: logging.Logger, checkpointer, key: str, window: Window) -> None:
+        """
+        :param logger: Logger.
+        :param checkpointer: KVStoreCheckpointer of the input.
+        :param key: Checkpoint key of the backfill, distinct from the key of the input checkpoint.
+        :param window: Interval to be collected. The interval of an interrupted backfill starting
+            at the same time is resumed instead, so that its completed windows still apply.
+        """
+        self.logger = logger
+        self.checkpointer = checkpointer
+        self.key = key
+        self.window = window
+        self.done: List[Window] = []
+
+        state = checkpointer.get(key)
+        if state:
+            previous = parse_interval(state["interval"])
+            if previous[0] == window[0]:
+                self.window = previous
+                self.done = [parse_interval(interval) for interval in state["done"]]
+                self.logger.info(f"Resuming backfill of {state['interval']}, {len(self.done)} windows already collected")
+            else:
+                self.logger.info(f"Discarding backfill of {state['interval']}, the checkpoint moved since")
+
+    def remaining(self, windows: Iterable[Window]) -> List[Window]:
+        """
+        :param windows: Windows of the interval.
+        :return: Parts of the windows not collected yet.
+        """
+        return subtract(windows, self.done)
+
+    def complete(self, window: Window) -> None:
+        """
+        Record a collected window.
+        :param window: Tuple (start, end).
+        """
+        self.done.append(window)
+        self.checkpointer.update(self.key, {
+            "interval": format_interval(self.window),
+            "done": [format_interval(w) for w in self.merged()],
+        })
+
+    def collected(self) -> bool:
+        """
+        :return: True once every part of the interval has been collected.
+        """
+        return not self.remaining([self.window])
+
+    def merged(self) -> List[Window]:
+        """
+        :return: Collected windows, adjacent ones merged to keep the checkpoint small.
+        """
+        merged = []
+        for start, end in sorted(self.done):
+            if merged and start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(end, merged[-1][1]))
+            else:
+                merged.append((start, end))
+        return merged
+
+    def finish(self) -> None:
+        """
+        Drop the progress once the whole interval is collected.
+        """
+        self.checkpointer.delete(self.key)
@@ -0,0 +1,483 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple, Type, Union
+from solnlib.conf_manager import (
+    ConfManager, ConfManagerException, ConfStanzaNotExistException, InvalidHostnameError, InvalidPortError
+)
+from solnlib.credentials import CredentialManager, CredentialNotExistException
+from solnlib.net_utils import is_valid_hostname, is_valid_port
+from solnlib.splunkenv import make_splunkhome_path
+from solnlib.utils import is_true
+from genesyscloud_models import GCBaseModel
+
+ADDON_NAME = "genesys_cloud_ta"
+
+
+class TokenCache:
+    """
+    OAuth tokens stored encrypted in the Splunk credential store (storage/passwords),
+    so that the inputs of an account reuse them across runs instead of requesting one per run.
+    """
+    REALM: str = f"__REST_CREDENTIAL__#{ADDON_NAME}#token_cache"
+
+    def __init__(self, logger: logging.Logger, session_key: str) -> None:
+        self.logger = logger
+        self.manager = CredentialManager(session_key, ADDON_NAME, realm=self.REALM)
+
+    def get(self, key: str) -> Optional[dict]:
+        """
+        Get a cached token.
+        :param key: Cache key, see GenesysCloudClient.
+        :return: Dictionary with access_token and expires_at (epoch seconds), or None if not cached.
+        """
+        try:
+            return json.loads(self.manager.get_password(key))
+        except CredentialNotExistException:
+            return None
+
+    def set(self, key: str, access_token: str, expires_at: float) -> None:
+        """
+        Cache a token.
+        :param key: Cache key, see GenesysCloudClient.
+        :param access_token: OAuth access token.
+        :param expires_at: Expiration time of the token (epoch seconds).
+        """
+        self.manager.set_password(key, json.dumps({"access_token": access_token, "expires_at": expires_at}))
+
+
+class ConfigCache:
+    """
+    Add-on configuration files read in a single call (all stanzas, decrypted) and memoized per session key,
+    so that an input run does not issue one REST round trip per account property or setting.
+    Entries expire after TTL seconds, so configuration changes are picked up by later runs.
+    """
+    TTL: float = 300.0
+    ACCOUNT_CONF: str = "genesys_cloud_ta_account"
+    SETTINGS_CONF: str = "genesys_cloud_ta_settings"
+    EAI_KEYS: Tuple[str, ...] = ("disabled", "eai:access", "eai:appName", "eai:userName")
+
+    _entries: Dict[Tuple[str, str], Tuple[float, dict]] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_conf(cls, session_key: str, conf_name: str) -> dict:
+        """
+        Get all stanzas of a configuration file.
+        :param session_key: Splunk session key.
+        :param conf_name: Configuration file name.
+        :return: Dictionary of stanzas, keyed by stanza name.
+        """
+        key = (session_key, conf_name)
+        with cls._lock:
+            entry = cls._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                return entry[1]
+
+        # Fetched without the lock, so that a slow REST call does not block the other configuration files.
+        # Concurrent misses of the same file may both fetch it; the last one stored wins.
+        cfm = ConfManager(
+            session_key,
+            ADDON_NAME,
+            realm=f"__REST_CREDENTIAL__#{ADDON_NAME}#configs/conf-{conf_name}",
+        )
+        stanzas = cfm.get_conf(conf_name).get_all()
+        with cls._lock:
+            cls._entries[key] = (time.monotonic() + cls.TTL, stanzas)
+        return stanzas
+
+    @classmethod
+    def get_stanza(cls, session_key: str, conf_name: str, stanza: str) -> dict:
+        """
+        Get a stanza of a configuration file, without the fields added by Splunk (eai:*, disabled).
+        :param session_key: Splunk session key.
+        :param conf_name: Configuration file name.
+        :param stanza: Stanza name.
+        :return: Copy of the stanza.
+        """
+        stanzas = cls.get_conf(session_key, conf_name)
+        if stanza not in stanzas:
+            raise ConfStanzaNotExistException(f"Stanza: {stanza} does not exist in {conf_name}.conf")
+        return {k: v for k, v in stanzas[stanza].items() if k not in cls.EAI_KEYS}
+
+    @classmethod
+    def get_account(cls, session_key: str, account_name: str) -> dict:
+        """
+        Get the configuration of an account.
+        :param session_key: Splunk session key.
+        :param account_name: Account name.
+        :return: Dictionary with region, client_id, client_secret and max_concurrency.
+        """
+        return cls.get_stanza(session_key, cls.ACCOUNT_CONF, account_name)
+
+    @classmethod
+    def get_log_level(cls, logger: logging.Logger, session_key: str, default: str = "INFO") -> str:
+        """
+        Get the log level of the add-on. Same fallbacks as solnlib conf_manager.get_log_level.
+        :param logger: Logger.
+        :param session_key: Splunk session key.
+        :param default: Log level returned if it is not configured.
+        :return: Log level.
+        """
+        try:
+            return cls.get_conf(session_key, cls.SETTINGS_CONF)["logging"].get("loglevel", default)
+        except ConfManagerException:
+            logger.error(f"Failed to fetch configuration file {cls.SETTINGS_CONF}, taking {default} as log level.")
+        except KeyError:
+            logger.error(f'"logging" stanza does not exist under {cls.SETTINGS_CONF}, taking {default} as log level.')
+        return default
+
+    @classmethod
+    def get_proxy_dict(cls, logger: logging.Logger, session_key: str) -> dict:
+        """
+        Get the proxy settings of the add-on. When the proxy is enabled, its host and port are validated
+        as in solnlib conf_manager.get_proxy_dict.
+        :param logger: Logger.
+        :param session_key: Splunk session key.
+        :return: Proxy settings, empty if the proxy was never configured.
+        :raises InvalidHostnameError: The proxy is enabled with an invalid host.
+        :raises InvalidPortError: The proxy is enabled with an invalid port.
+        """
+        try:
+            proxy_dict = cls.get_stanza(session_key, cls.SETTINGS_CONF, "proxy")
+        except ConfStanzaNotExistException:
+            return {}
+        if is_true(proxy_dict.get("proxy_enabled")):
+            cls.validate_proxy(logger, proxy_dict)
+        return proxy_dict
+
+    @staticmethod
+    def validate_proxy(logger: logging.Logger, proxy_dict: dict) -> None:
+        """
+        Validate the host and port of proxy settings.
+        :param logger: Logger.
+        :param proxy_dict: Proxy settings.
+        :raises InvalidHostnameError: proxy_url is not a valid hostname or IP address.
+        :raises InvalidPortError: proxy_port is not a port number.
+        """
+        if not is_valid_hostname(str(proxy_dict.get("proxy_url", ""))):
+            logger.error("Proxy configuration error: invalid proxy host provided.")
+            raise InvalidHostnameError("The provided hostname is not valid.")
+        if not is_valid_port(str(proxy_dict.get("proxy_port", ""))):
+            logger.error("Proxy configuration error: invalid proxy port provided.")
+            raise InvalidPortError("The provided port is not valid.")
+
+    @classmethod
+    def clear(cls) -> None:
+        """
+        Drop all memoized configuration files.
+        """
+        with cls._lock:
+            cls._entries.clear()
+
+
+class SQLiteStore:
+    """
+    Base of the caches stored in a SQLite file of the add-on, shared by all the inputs.
+    """
+    FILENAME: str = None
+    SCHEMA: Tuple[str, ...] = ()
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        """
+        :param path: SQLite file, defaults to FILENAME in the add-on directory under the modular inputs checkpoints.
+        """
+        self.path = path or make_splunkhome_path(["var", "lib", "splunk", "modinputs", ADDON_NAME, self.FILENAME])
+
+    def _connect(self) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        # Inputs run in separate processes: wait for the lock of a concurrent update
+        connection = sqlite3.connect(self.path, timeout=30)
+        for statement in self.SCHEMA:
+            connection.execute(statement)
+        return connection
+
+
+class EntityCache(SQLiteStore):
+    """
+    Snapshots of the Genesys Cloud inventories (users, queues) of an account,
+    stored in a SQLite file shared by all the inputs, so that the directories are downloaded
+    once per TTL instead of on every run of every input.
+    Only the projection of each entity used for the enrichments (GCBaseModel.project) is stored.
+    """
+    DEFAULT_TTL: float = 3600.0
+    FILENAME: str = "entity_cache.db"
+    SCHEMA: Tuple[str, ...] = (
+        "CREATE TABLE IF NOT EXISTS snapshots ("
+        "account TEXT NOT NULL, kind TEXT NOT NULL, refreshed_at REAL NOT NULL, "
+        "PRIMARY KEY (account, kind))",
+        "CREATE TABLE IF NOT EXISTS entities ("
+        "account TEXT NOT NULL, kind TEXT NOT NULL, position INTEGER NOT NULL, data TEXT NOT NULL, "
+        "PRIMARY KEY (account, kind, position))",
+    )
+
+    def __init__(self, logger: logging.Logger, account: str, ttl: Optional[float] = None, path: Optional[str] = None) -> None:
+        """
+        :param logger: Logger.
+        :param account: Account name, snapshots are not shared between accounts.
+        :param ttl: Age in seconds after which a snapshot is downloaded again, 0 disables the cache.
+        :param path: SQLite file, see SQLiteStore.
+        """
+        super().__init__(path)
+        self.logger = logger
+        self.account = account
+        self.ttl = self.DEFAULT_TTL if ttl in (None, "") else float(ttl)
+
+    def get(self, kind: str) -> Optional[List[dict]]:
+        """
+        Get a snapshot.
+        :param kind: Entity type, e.g. "users".
+        :return: List of entities, or None if there is no snapshot or it is older than the TTL.
+        """
+        connection = self._connect()
+        try:
+            row = connection.execute(
+                "SELECT refreshed_at FROM snapshots WHERE account = ? AND kind = ?", (self.account, kind)
+            ).fetchone()
+            if row is None or row[0] + self.ttl <= time.time():
+                return None
+            rows = connection.execute(
+                "SELECT data FROM entities WHERE account = ? AND kind = ? ORDER BY position", (self.account, kind)
+            )
+            return [json.loads(data) for data, in rows]
+        finally:
+            connection.close()
+
+    def set(self, kind: str, entities: Iterable[dict]) -> None:
+        """
+        Replace a snapshot.
+        :param kind: Entity type, e.g. "users".
+        :param entities: JSON serializable entities.
+        """
+        connection = self._connect()
+        try:
+            with connection:
+                connection.execute("DELETE FROM entities WHERE account = ? AND kind = ?", (self.account, kind))
+                connection.executemany(
+                    "INSERT INTO entities (account, kind, position, data) VALUES (?, ?, ?, ?)",
+                    (
+                        (self.account, kind, position, json.dumps(entity, ensure_ascii=False, default=str))
+                        for position, entity in enumerate(entities)
+                    )
+                )
+                connection.execute(
+                    "INSERT OR REPLACE INTO snapshots (account, kind, refreshed_at) VALUES (?, ?, ?)",
+                    (self.account, kind, time.time())
+                )
+        finally:
+            connection.close()
+
+    def load(self, model_class: Type[GCBaseModel], kind: str, fetch: Callable[[], Iterable]) -> GCBaseModel:
+        """
+        Build a model from the snapshot, downloading and storing the inventory again if it expired.
+        Cache errors are logged and the inventory is downloaded as without cache.
+        :param model_class: Model of the entities, e.g. UserModel.
+        :param kind: Entity type, e.g. "users".
+        :param fetch: Function returning the entities from the API.
+        :return: Model instance.
+        """
+        if self.ttl > 0:
+            try:
+                entities = self.get(kind)
+                if entities is not None:
+                    self.logger.debug(f"Using the cached {kind} of account {self.account} ({len(entities)} entities)")
+                    return model_class(entities)
+            except sqlite3.Error as e:
+                self.logger.warning(f"Failed to read the {kind} cache: {e}")
+
+        model = model_class(fetch())
+        if self.ttl > 0:
+            try:
+                self.set(kind, (model.project(item) for item in model.data))
+            except sqlite3.Error as e:
+                self.logger.warning(f"Failed to update the {kind} cache: {e}")
+        return model
+
+
+class ResponseCache(SQLiteStore):
+    """
+    Bodies of GET responses stored with their validators (ETag, Last-Modified), so that requests
+    can be made conditional and a 304 Not Modified answered from the stored body.
+    Responses not stored again within max_age seconds are dropped.
+    """
+    DEFAULT_MAX_AGE: float = 7 * 86400.0
+    FILENAME: str = "response_cache.db"
+    SCHEMA: Tuple[str, ...] = (
+        "CREATE TABLE IF NOT EXISTS responses ("
+        "key TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, data BLOB NOT NULL, stored_at REAL NOT NULL)",
+    )
+
+    def __init__(self, logger: logging.Logger, max_age: Optional[float] = None, path: Optional[str] = None) -> None:
+        """
+        :param logger: Logger.
+        :param max_age: Seconds a response is kept after it was stored.
+        :param path: SQLite file, see SQLiteStore.
+        """
+        super().__init__(path)
+        self.logger = logger
+        self.max_age = self.DEFAULT_MAX_AGE if max_age is None else max_age
+        self._pruned = False
+
+    def get(self, key: str) -> Optional[dict]:
+        """
+        Get a stored response.
+        :param key: Request key, including the account and the query parameters.
+        :return: Dictionary with etag, last_modified and data, or None if not stored.
+        """
+        connection = self._connect()
+        try:
+            row = connection.execute(
+                "SELECT etag, last_modified, data FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        finally:
+            connection.close()
+        if row is None:
+            return None
+        return {"etag": row[0], "last_modified": row[1], "data": row[2]}
+
+    def set(self, key: str, etag: Optional[str], last_modified: Optional[str], data: Union[str, bytes]) -> None:
+        """
+        Store a response. The expired responses are pruned on the first store of each instance.
+        :param key: Request key, including the account and the query parameters.
+        :param etag: ETag header of the response.
+        :param last_modified: Last-Modified header of the response.
+        :param data: Body of the response, as text or bytes. It is returned as stored.
+        """
+        if not self._pruned:
+            self.prune()
+        connection = self._connect()
+        try:
+            with connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO responses (key, etag, last_modified, data, stored_at) VALUES (?, ?, ?, ?, ?)",
+                    (key, etag, last_modified, data, time.time())
+                )
+        finally:
+            connection.close()
+
+    def prune(self) -> None:
+        """
+        Drop the responses stored more than max_age seconds ago.
+        """
+        self._pruned = True
+        try:
+            connection = self._connect()
+            try:
+                with connection:
+                    connection.execute(
+                        "DELETE FROM responses WHERE stored_at < ?", (time.time() - self.max_age,)
+                    )
+            finally:
+                connection.close()
+        except sqlite3.Error as e:
+            self.logger.warning(f"Failed to prune the response cache: {e}")
+
+    @staticmethod
+    def conditional_headers(entry: Optional[dict]) -> dict:
+        """
+        Build the headers of a conditional request.
+        :param entry: Stored response, see get.
+        :return: If-None-Match and If-Modified-Since headers, empty without a stored response.
+        """
+        headers = {}
+        if entry:
+            if entry["etag"]:
+                headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+
+class DedupStore(SQLiteStore):
+    """
+    Versions of the records written by an input, e.g. conversation ids with their end, so that
+    the records collected again by overlapping intervals are only written once they changed.
+    Only the max_entries records seen most recently by each input are kept (LRU).
+    """
+    DEFAULT_MAX_ENTRIES: int = 100000
+    FILENAME: str = "dedup.db"
+    SCHEMA: Tuple[str, ...] = (
+        # Records are replaced when seen again: rowids follow the order in which they were last seen
+        "CREATE TABLE IF NOT EXISTS seen ("
+        "namespace TEXT NOT NULL, id TEXT NOT NULL, version TEXT NOT NULL, PRIMARY KEY (namespace, id))",
+    )
+    # Bound of the variables of a SQLite statement
+    CHUNK_SIZE: int = 500
+
+    def __init__(self, logger: logging.Logger, namespace: str, max_entries: Optional[int] = None,
+                 path: Optional[str] = None) -> None:
+        """
+        :param logger: Logger.
+        :param namespace: Name of the input, records are not shared between inputs.
+        :param max_entries: Number of records kept.
+        :param path: SQLite file, see SQLiteStore.
+        """
+        super().__init__(path)
+        self.logger = logger
+        self.namespace = namespace
+        self.max_entries = max_entries or self.DEFAULT_MAX_ENTRIES
+
+    def changed(self, versions: Dict[str, Optional[str]]) -> Set[str]:
+        """
+        Select the records not written yet in their current version.
+        Store errors are logged and every record is selected, duplicates being preferred to gaps.
+        :param versions: Version of each record by id, e.g. the end of a conversation, None while open.
+        :return: IDs of the records not seen or seen with another version.
+        """
+        ids = list(versions)
+        stored = {}
+        try:
+            connection = self._connect()
+            try:
+                for i in range(0, len(ids), self.CHUNK_SIZE):
+                    chunk = ids[i:i + self.CHUNK_SIZE]
+                    rows = connection.execute(
+                        f"SELECT id, version FROM seen WHERE namespace = ? AND id IN ({','.join('?' * len(chunk))})",
+                        (self.namespace, *chunk)
+                    )
+                    stored.update(rows)
+            finally:
+                connection.close()
+        except sqlite3.Error as e:
+            self.logger.warning(f"Failed to read the records already written: {e}")
+        return {record_id for record_id in ids if stored.get(record_id) != (versions[record_id] or "")}
+
+    def add(self, versions: Dict[str, Optional[str]]) -> None:
+        """
+        Record written records.
+        :param versions: Version of each record by id, see changed.
+        """
+        try:
+            connection = self._connect()
+            try:
+                with connection:
+                    connection.executemany(
+                        "INSERT OR REPLACE INTO seen (namespace, id, version) VALUES (?, ?, ?)",
+                        ((self.namespace, record_id, version or "") for record_id, version in versions.items())
+                    )
+            finally:
+                connection.close()
+        except sqlite3.Error as e:
+            self.logger.warning(f"Failed to record the records written: {e}")
+
+    def prune(self) -> None:
+        """
+        Drop the records seen least recently beyond max_entries.
+        """
+        try:
+            connection = self._connect()
+            try:
+                with connection:
+                    connection.execute(
+                        "DELETE FROM seen WHERE namespace = ? AND rowid < ("
+                        "SELECT rowid FROM seen WHERE namespace = ? ORDER BY rowid DESC LIMIT 1 OFFSET ?)",
+                        (self.namespace, self.namespace, self.max_entries - 1)
+                    )
+            finally:
+                connection.close()
+        except sqlite3.Error as e:
+            self.logger.warning(f"Failed to prune the records written: {e}")
@@ -1,15 +1,31 @@
 import PureCloudPlatformClientV2
+import base64
+import codecs
+import copy
+import functools
 import logging
 import json
+import math
 import os
+import random
+import re
+import ssl
+import threading
+import time
 import urllib3
 
-from typing import List
+from typing import Callable, Iterable, Iterator, List, Optional
 from io import BytesIO
+from itertools import islice
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from urllib.parse import urlencode
 from solnlib.utils import is_true
-from PureCloudPlatformClientV2.rest import ApiException
-from PureCloudPlatformClientV2.api_client import ApiClient
+from PureCloudPlatformClientV2.rest import ApiException, RESTClientObject
+from PureCloudPlatformClientV2.api_client import ApiClient, HttpRequestOptions
 from PureCloudPlatformClientV2.configuration import Configuration
+from PureCloudPlatformClientV2.default_http_client import DefaultHttpClient
 
 
 class ProxyHandler:
@@ -51,12 +67,422 @@ class ProxyHandler:
             return self.url_auth
 
 
+class ConnectionPool:
+    """
+    Process-wide urllib3 pool managers, keyed by proxy configuration and pool size.
+    The SDK REST client, downloads and the status page share them, so keep-alive connections,
+    and their TLS sessions, are reused between requests instead of being set up per call.
+    Connections are kept alive but not pipelined: urllib3 sends one request at a time per connection.
+    """
+    # Connections kept per host when no size is given
+    DEFAULT_MAX_SIZE: int = 4
+    # Hosts a pool manager keeps connections to, e.g. API, login, download and status page hosts
+    NUM_POOLS: int = 10
+    _managers = {}
+    _managers_lock = threading.Lock()
+
+    @classmethod
+    def manager(cls, proxy_url: str = None, proxy_username: str = None, proxy_password: str = None,
+                max_size: int = None) -> urllib3.PoolManager:
+        """
+        Get the pool manager for a proxy configuration, creating it on first use.
+        :param proxy_url: Proxy URL without credentials, e.g. http://proxy:3128. None for direct connections.
+        :param max_size: Connections kept per host. Requests wait for a free connection beyond it.
+        """
+        max_size = max(1, int(max_size or cls.DEFAULT_MAX_SIZE))
+        key = (proxy_url, proxy_username, proxy_password, max_size)
+        with cls._managers_lock:
+            manager = cls._managers.get(key)
+            if manager is None:
+                manager = cls._managers[key] = cls._create(proxy_url, proxy_username, proxy_password, max_size)
+            return manager
+
+    @classmethod
+    def _create(cls, proxy_url: str, proxy_username: str, proxy_password: str, max_size: int) -> urllib3.PoolManager:
+        # Same settings as the SDK REST client
+        config = Configuration()
+        retries = urllib3.util.Retry()
+        retries.allowed_methods = {"DELETE", "GET", "HEAD", "OPTIONS", "POST", "PUT", "PATCH", "TRACE"}
+        kwargs = {
+            "retries": retries,
+            "num_pools": cls.NUM_POOLS,
+            "maxsize": max_size,
+            "block": True,
+            "cert_reqs": ssl.CERT_REQUIRED if config.verify_ssl else ssl.CERT_NONE,
+        }
+        if config.verify_ssl and config.ssl_context:
+            kwargs["ssl_context"] = config.ssl_context
+
+        if not proxy_url:
+            return urllib3.PoolManager(**kwargs)
+        if proxy_url.startswith("socks"):
+            # Requires PySocks, as SOCKS proxies do with requests
+            from urllib3.contrib.socks import SOCKSProxyManager
+            return SOCKSProxyManager(proxy_url, username=proxy_username, password=proxy_password, **kwargs)
+        if proxy_username and proxy_password:
+            kwargs["proxy_headers"] = urllib3.make_headers(proxy_basic_auth=f"{proxy_username}:{proxy_password}")
+        return urllib3.ProxyManager(proxy_url, **kwargs)
+
+    @classmethod
+    def rest_client(cls, max_size: int = None) -> RESTClientObject:
+        """
+        Get an SDK REST client sending its requests through the pool of the proxy set in Configuration().
+        :param max_size: Connections kept per host.
+        """
+        config = Configuration()
+        rest_client = RESTClientObject(max_size=max(1, int(max_size or cls.DEFAULT_MAX_SIZE)))
+        rest_client.pool_manager = cls.manager(config.proxy, config.proxy_username, config.proxy_password, max_size)
+        return rest_client
+
+
+def response_field(response, name: str):
+    """
+    Get a field of an API response, whether deserialized into an SDK model or kept as raw JSON.
+    :param response: SDK model or dictionary.
+    :param name: Field name as exposed by the SDK models, e.g. total_hits.
+    """
+    if isinstance(response, dict):
+        return response.get(re.sub(r'_([a-z])', lambda m: m.group(1).upper(), name))
+    return getattr(response, name, None)
+
+
+class JsonRecord(str):
+    """
+    JSON text of a record as received, written to events without being re-encoded.
+    Top-level fields are read with get, decoding only their value.
+    """
+    # Text up to the next bracket outside of strings
+    RUN = re.compile(r'[^"\[\]{}]*(?:"[^"\\]*(?:\\.[^"\\]*)*"[^"\[\]{}]*)*')
+    scan_once = staticmethod(json.JSONDecoder().scan_once)
+
+    def get(self, key: str, default=None):
+        """
+        Read a top-level field of a record.
+        :param key: Field name, e.g. eventTime.
+        :param default: Returned if the record has no such field.
+        :return: Decoded value of the field.
+        """
+        for match in re.finditer(rf'"{re.escape(key)}"[ \t\n\r]*:[ \t\n\r]*', self):
+            if self._depth(match.start()) == 1:
+                return self.scan_once(self, match.end())[0]
+        return default
+
+    def _depth(self, limit: int) -> Optional[int]:
+        """
+        :return: Nesting depth at limit, or None if limit is inside a string.
+        """
+        depth = 0
+        i = 0
+        while True:
+            i = self.RUN.match(self, i, limit).end()
+            if i == limit:
+                return depth
+            if self[i] == '"':
+                return None
+            depth += 1 if self[i] in "[{" else -1
+            i += 1
+
+
+class JsonArraySplitter:
+    """
+    Split a JSON array, fed chunk by chunk, into the JSON text of its elements.
+    Elements are delimited by the C decoder of the json module, the fastest way to find where
+    they end, and sliced out of the input. The decoded values are dropped right away.
+    """
+    scan_once = staticmethod(json.JSONDecoder().scan_once)
+    WHITESPACE = re.compile(r"[ \t\n\r]*")
+    NUMBER_CHARS = re.compile(r"[0-9.eE+-]*")
+
+    def __init__(self):
+        self.decoder = codecs.getincrementaldecoder("utf-8")()
+        self.text = ""
+        self.pos = 0
+        # One of: start, first (after "["), value (after ","), separator (after a value), end
+        self.state = "start"
+
+    def feed(self, chunk: bytes, final: bool = False) -> List[JsonRecord]:
+        """
+        Add a chunk of the array.
+        :param chunk: Bytes following the previously fed ones.
+        :param final: No more bytes follow.
+        :return: Elements completed by the chunk.
+        """
+        records = []
+        text = self.text = self.text[self.pos:] + self.decoder.decode(chunk, final)
+        size = len(text)
+        pos = 0
+        while self.state != "end":
+            pos = self.WHITESPACE.match(text, pos).end()
+            if pos == size:
+                break
+            char = text[pos]
+            if self.state == "start":
+                if char != "[":
+                    raise ValueError("Expected a JSON array")
+                self.state = "first"
+                pos += 1
+            elif self.state == "separator" or (self.state == "first" and char == "]"):
+                if char not in ",]":
+                    raise ValueError(f"Expected ',' or ']' at position {pos}")
+                self.state = "value" if char == "," else "end"
+                pos += 1
+            else:
+                try:
+                    value, end = self.scan_once(text, pos)
+                except (StopIteration, json.JSONDecodeError):
+                    if final:
+                        raise ValueError(f"Invalid JSON value at position {pos}")
+                    # Element continued in the next chunk
+                    break
+                if not final and type(value) in (int, float) and self.NUMBER_CHARS.match(text, end).end() == size:
+                    # The number could go on in the next chunk
+                    break
+                records.append(JsonRecord(text[pos:end]))
+                if end < size and text[end] == ",":
+                    # Compact arrays: the next element follows right away
+                    self.state = "value"
+                    pos = end + 1
+                else:
+                    self.state = "separator"
+                    pos = end
+        self.pos = pos
+        return records
+
+    def close(self) -> List[JsonRecord]:
+        """
+        Signal the end of the array.
+        :return: Elements completed by the end of the input.
+        """
+        records = self.feed(b"", final=True)
+        if self.state != "end":
+            raise ValueError("Truncated JSON array")
+        return records
+
+
+class RawResponseApiClient(ApiClient):
+    """
+    ApiClient able to return the JSON body of responses as plain dictionaries,
+    skipping their deserialization into SDK models.
+    Raw mode is enabled per thread, so concurrent calls are not affected.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.raw_mode = threading.local()
+
+    @contextmanager
+    def raw_responses(self):
+        previous = getattr(self.raw_mode, "enabled", False)
+        self.raw_mode.enabled = True
+        try:
+            yield
+        finally:
+            self.raw_mode.enabled = previous
+
+    def deserialize(self, response, response_type):
+        if response_type == "file" or not getattr(self.raw_mode, "enabled", False):
+            return super().deserialize(response, response_type)
+        return json.loads(response.data) if response.data else None
+
+
+class CachedResponse:
+    """
+    Response answered with the stored body of a request after a 304 Not Modified.
+    The headers are the ones of the 304, e.g. for the rate limit.
+    """
+    def __init__(self, status: int, reason: str, headers, data: bytes) -> None:
+        self.status = status
+        self.reason = reason
+        self.headers = headers or {}
+        self.data = data
+
+    def getheaders(self):
+        return self.headers
+
+    def getheader(self, name: str, default=None):
+        return self.headers.get(name, default)
+
+
+class ConditionalHttpClient(DefaultHttpClient):
+    """
+    HTTP client of the SDK sending the inventory GET requests with the validators of the
+    previous response (If-None-Match, If-Modified-Since), so that unchanged inventories
+    are answered with a 304 and read from a ResponseCache instead of downloaded again.
+    """
+    # Paths of the inventories collected on every run
+    CONDITIONAL_PATHS: frozenset = frozenset((
+        "/api/v2/users",
+        "/api/v2/routing/queues",
+        "/api/v2/telephony/providers/edges",
+        "/api/v2/telephony/providers/edges/trunks",
+    ))
+    # Query parameters adding fields that change between runs, e.g. the routing status of the users
+    VOLATILE_PARAMS: frozenset = frozenset(("expand",))
+
+    def __init__(self, logger: logging.Logger, response_cache=None, namespace: str = "") -> None:
+        """
+        :param logger: Logger.
+        :param response_cache: ResponseCache, conditional requests are disabled without it.
+        :param namespace: Prefix of the cache keys, responses of different organizations must not be mixed.
+        """
+        super().__init__()
+        self.logger = logger
+        self.response_cache = response_cache
+        self.namespace = namespace
+
+    def cache_key(self, options: HttpRequestOptions) -> str:
+        query = sorted((k, str(v)) for k, v in (options.query_params or {}).items())
+        return f"{self.namespace}|{options.url}?{urlencode(query)}"
+
+    def is_conditional(self, options: HttpRequestOptions) -> bool:
+        """
+        Whether a request is sent conditionally and its response stored.
+        Requests of volatile fields would be answered with a new body on every run: they are not.
+        """
+        return (
+            self.response_cache is not None and options.method == "GET"
+            and urllib3.util.parse_url(options.url).path in self.CONDITIONAL_PATHS
+            and not self.VOLATILE_PARAMS.intersection(options.query_params or {})
+        )
+
+    def request(self, http_request_options: HttpRequestOptions):
+        options = http_request_options
+        if not self.is_conditional(options):
+            return super().request(options)
+
+        key = self.cache_key(options)
+        try:
+            entry = self.response_cache.get(key)
+        except Exception as e:
+            self.logger.warning(f"Failed to read the response cache: {e}")
+            entry = None
+        options.headers = dict(options.headers or {}, **self.response_cache.conditional_headers(entry))
+
+        try:
+            response = super().request(options)
+        except ApiException as e:
+            if e.status != 304 or entry is None:
+                raise
+            self.logger.debug(f"Not modified, using the cached response of {key}")
+            response = CachedResponse(e.status, e.reason, e.headers, entry["data"])
+            if self.post_hook and callable(self.post_hook):
+                response = self.post_hook(response)
+            return response
+
+        etag = response.getheader("ETag")
+        last_modified = response.getheader("Last-Modified")
+        if etag or last_modified:
+            try:
+                self.response_cache.set(key, etag, last_modified, response.data)
+            except Exception as e:
+                self.logger.warning(f"Failed to update the response cache: {e}")
+        return response
+
+
+class RateLimiter:
+    """
+    Client-side token bucket for the Genesys Cloud API rate limit.
+
+    The limit applies per OAuth client, so a single bucket is shared by every client of the
+    process using the same client ID. The bucket is kept in sync with the `inin-ratelimit-*`
+    headers returned by the API, which also account for requests sent by other processes.
+    """
+    # Genesys Cloud default rate limit per OAuth client
+    DEFAULT_REQUESTS_PER_MINUTE: int = 300
+
+    _instances: dict = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, requests_per_minute: int = DEFAULT_REQUESTS_PER_MINUTE):
+        self.lock = threading.Lock()
+        self.capacity = float(requests_per_minute)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+    @classmethod
+    def shared(cls, key: str) -> "RateLimiter":
+        """
+        Get the rate limiter shared by every client using the same key (i.e. OAuth client ID).
+        """
+        with cls._instances_lock:
+            if key not in cls._instances:
+                cls._instances[key] = cls()
+            return cls._instances[key]
+
+    @property
+    def fill_rate(self) -> float:
+        return self.capacity / 60
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.fill_rate)
+        self.updated = now
+
+    def acquire(self) -> None:
+        """
+        Block until a request can be sent without exceeding the rate limit.
+        """
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self._refill(now)
+                wait = self.blocked_until - now
+                if wait <= 0:
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    wait = (1 - self.tokens) / self.fill_rate
+            time.sleep(wait)
+
+    def block(self, seconds: float) -> None:
+        """
+        Hold every request for the given number of seconds, e.g. after a 429.
+        """
+        with self.lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+            self.tokens = 0
+
+    def update(self, headers) -> None:
+        """
+        Synchronize the bucket with the `inin-ratelimit-*` headers of a response.
+        :param headers: Response headers.
+        """
+        try:
+            allowed = int(headers.get("inin-ratelimit-allowed"))
+            count = int(headers.get("inin-ratelimit-count"))
+            reset = float(headers.get("inin-ratelimit-reset"))
+        except (TypeError, ValueError):
+            return
+        with self.lock:
+            self._refill(time.monotonic())
+            self.capacity = float(max(allowed, 1))
+            self.tokens = min(self.tokens, float(allowed - count))
+        if allowed - count <= 0:
+            self.block(reset)
+
+
 class GenesysCloudClient:
     """
     Interface with Genesys Cloud
     """
-    def __init__(self, logger: logging.Logger, client_id: str, client_secret: str, aws_region: str, proxy_config: dict = None):
+    # Number of requests sent in parallel when no value is configured for the account
+    DEFAULT_MAX_CONCURRENCY: int = 4
+    # Typically 100 items per page is the max accepted
+    POST_PAGE_SIZE: int = 100
+    # Retries of a request rejected for exceeding the rate limit
+    MAX_RETRIES: int = 5
+    # Bounds (seconds) of the exponential backoff used when no Retry-After header is returned
+    BACKOFF_BASE: float = 1.0
+    BACKOFF_MAX: float = 60.0
+    # Tokens are renewed this many seconds before they expire
+    TOKEN_REFRESH_MARGIN: float = 300.0
+
+    def __init__(self, logger: logging.Logger, client_id: str, client_secret: str, aws_region: str,
+                 proxy_config: dict = None, max_concurrency: int = None, token_cache=None, response_cache=None):
         self.logger = logger
+        self.max_concurrency = max(1, int(max_concurrency or self.DEFAULT_MAX_CONCURRENCY))
+        # Requests in flight, shared by the worker pools of the client, including nested ones
+        # such as the pages of each query of iter_post_many
+        self.in_flight = threading.BoundedSemaphore(self.max_concurrency)
         proxy_handler = ProxyHandler(logger, proxy_config)
         if PureCloudPlatformClientV2.PureCloudRegionHosts.__members__.get(aws_region):
             region = PureCloudPlatformClientV2.PureCloudRegionHosts[aws_region]
@@ -75,12 +501,145 @@ class GenesysCloudClient:
         config.proxy_password = proxy_handler.password
 
         # Note that passing self.host to the client can be removed as per singleton behavior.
-        self.client = ApiClient(self.host).get_client_credentials_token(
-            client_id, client_secret
+        api_client = RawResponseApiClient(self.host)
+        # The SDK keeps 4 connections per host by default and blocks when all of them are in use.
+        # Size the pool so concurrent requests reuse keep-alive connections instead of waiting,
+        # and share it with downloads and the other clients of the process, token requests included.
+        self.pool = ConnectionPool.manager(
+            proxy_handler.url, proxy_handler.username, proxy_handler.password, self.max_concurrency
         )
+        # Inventory requests are conditional when a ResponseCache is given, per OAuth client and region
+        http_client = ConditionalHttpClient(logger, response_cache, f"{client_id}@{aws_region}")
+        http_client.rest_client = ConnectionPool.rest_client(self.max_concurrency)
+        api_client.set_http_client(http_client)
+        self.client = api_client
 
-    def _fetch(self, api_instance, f_name: str, *args, **kwargs):
-        items = []
+        # Tokens are cached per OAuth client and region, e.g. in a TokenCache, and shared by every input
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.token_cache = token_cache
+        self.token_key = f"{client_id}@{aws_region}"
+        self.token_expires_at = 0.0
+        self.token_lock = threading.Lock()
+        self._authenticate()
+
+        self.rate_limiter = RateLimiter.shared(client_id)
+        self.client.get_http_client().set_post_request_hook(
+            lambda response: self._on_response(response)
+        )
+
+    def _request_token(self):
+        """
+        Request a token with the client credentials grant.
+        Unlike ApiClient.get_client_credentials_token, the lifetime of the token is returned.
+        :return: Tuple (access token, lifetime in seconds).
+        """
+        auth_string = base64.b64encode(f"{self.client_id}:{self.client_secret}".encode("ascii")).decode("ascii")
+        request_options = HttpRequestOptions(
+            url=self.client.get_conf_url("login", self.host) + "/oauth/token",
+            method="POST",
+            headers={
+                "Authorization": f"Basic {auth_string}",
+                "Content-Type": "application/x-www-form-urlencoded"
+            },
+            post_params={"grant_type": "client_credentials"},
+            body=None
+        )
+        data = json.loads(self.client.get_http_client().request(request_options).data)
+        return data["access_token"], float(data.get("expires_in", 0))
+
+    def _authenticate(self, expired_token: str = None) -> None:
+        """
+        Set the token of the client: the cached one if it is not about to expire, a new one otherwise.
+        :param expired_token: Token rejected by the API. The cache is bypassed unless another thread already replaced it.
+        """
+        with self.token_lock:
+            now = time.time()
+            if expired_token is not None:
+                if self.client.access_token != expired_token:
+                    return
+            elif self.token_expires_at - now > self.TOKEN_REFRESH_MARGIN:
+                # Renewed by another thread in the meantime
+                return
+            elif self.token_cache is not None:
+                try:
+                    cached = self.token_cache.get(self.token_key)
+                except Exception as e:
+                    self.logger.warning(f"Failed to read the token cache: {e}")
+                    cached = None
+                if cached and cached["expires_at"] - now > self.TOKEN_REFRESH_MARGIN:
+                    self.logger.debug("Using cached token")
+                    self.client.access_token = cached["access_token"]
+                    self.token_expires_at = cached["expires_at"]
+                    return
+
+            self.logger.debug("Requesting a new token")
+            access_token, expires_in = self._request_token()
+            self.client.access_token = access_token
+            self.token_expires_at = now + expires_in
+            if self.token_cache is not None:
+                try:
+                    self.token_cache.set(self.token_key, access_token, self.token_expires_at)
+                except Exception as e:
+                    self.logger.warning(f"Failed to update the token cache: {e}")
+
+    def _on_response(self, response):
+        self.rate_limiter.update(response.getheaders())
+        return response
+
+    def _call(self, function: Callable, *args, **kwargs):
+        """
+        Call an API function within the rate limit, with at most max_concurrency calls in flight.
+        Requests rejected with a 429 are retried once the time given by the Retry-After header,
+        or a jittered exponential backoff, has elapsed.
+        The token is renewed shortly before it expires, and once if the API rejects it.
+        """
+        reauthenticated = False
+        for attempt in range(self.MAX_RETRIES + 1):
+            if self.token_expires_at - time.time() <= self.TOKEN_REFRESH_MARGIN:
+                self._authenticate()
+            try:
+                with self.in_flight:
+                    self.rate_limiter.acquire()
+                    access_token = self.client.access_token
+                    return function(*args, **kwargs)
+            except ApiException as e:
+                if e.status == 401 and not reauthenticated and attempt < self.MAX_RETRIES:
+                    # Revoked or cached token no longer valid
+                    self.logger.warning("Token rejected. Requesting a new token.")
+                    reauthenticated = True
+                    self._authenticate(expired_token=access_token)
+                    continue
+                if e.status != 429 or attempt == self.MAX_RETRIES:
+                    raise
+                headers = e.headers or {}
+                try:
+                    delay = float(headers.get("Retry-After"))
+                except (TypeError, ValueError):
+                    delay = random.uniform(0, min(self.BACKOFF_MAX, self.BACKOFF_BASE * 2 ** attempt))
+                self.logger.warning(f"Rate limit exceeded. Retrying in {delay:.1f}s (attempt {attempt + 1}/{self.MAX_RETRIES})")
+                self.rate_limiter.block(delay)
+
+    def _as_raw(self, function: Callable) -> Callable:
+        """
+        Wrap an API function so that it returns the JSON body of the response as dictionaries.
+        """
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with self.client.raw_responses():
+                return function(*args, **kwargs)
+        return wrapper
+
+    def _iter_fetch(self, api_instance, f_name: str, *args, raw: bool = False, items_key: str = None,
+                    **kwargs) -> Iterator:
+        """
+        Fetch entities page by page.
+        The request for the next page is sent before the entities of the current page are yielded,
+        so that consumers can process them while the next page is in flight.
+        With raw, entities are the dictionaries parsed from the response body, keyed by API field names.
+        With items_key, entities are the items of that field instead of entities, e.g. conversations,
+        and pages are followed by cursor.
+        """
         enable_pagination = False
         pagination_params = {"page_number", "page_size", "page_count"}
         page_number = 1
@@ -90,63 +649,133 @@ class GenesysCloudClient:
 
         if not callable(function):
             raise AttributeError(f"{f_name} is not a callable function of the API instance")
+        if raw:
+            function = self._as_raw(function)
 
         # FIXME add a max_pages safeguard to avoid unbounded pagination
-        while True:
-            try:
-                api_response = function(*args, **kwargs)
-            except ApiException as e:
-                if e.status in (301, 302, 303, 307, 308):
-                    # When getting audit query results API could return a redirect with downloadUrl.
-                    body = json.loads(e.body)
-                    if "downloadUrl" in body.keys():
-                        self.logger.info(f"Got URL to download events from.")
-                        buf = self.download(body["downloadUrl"])
-                        for item in json.loads(buf.read()):
-                            items.append(item)
-
-                        if "cursor" in body.keys():
-                            cursor = body["cursor"]
-                            kwargs["cursor"] = cursor
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            next_page = executor.submit(self._call, function, *args, **kwargs)
+            while next_page is not None:
+                items = []
+                try:
+                    api_response = next_page.result()
+                except ApiException as e:
+                    if e.status in (301, 302, 303, 307, 308):
+                        # When getting audit query results API could return a redirect with downloadUrl.
+                        body = json.loads(e.body)
+                        if "downloadUrl" in body.keys():
+                            self.logger.info(f"Got URL to download events from.")
+                            next_page = None
+                            if "cursor" in body.keys():
+                                cursor = body["cursor"]
+                                kwargs["cursor"] = cursor
+                                next_page = executor.submit(self._call, function, *args, **kwargs)
+                            # Otherwise nothing else to be fetched
+                            # Records are streamed as they are downloaded and passed through as their JSON text
+                            yield from self.iter_download(body["downloadUrl"])
                             continue
-                        else:
-                            # Nothing else to be fetched
-                            break
-                    raise
-                else:
-                    raise
+                        raise
+                    else:
+                        raise
 
-            if isinstance(api_response, list):
-                # A simple list (of strings) is returned as response
-                items.extend(api_response)
-            else:
-                # An object such as EdgeEntityListing|RoutingStatus|AuditQueryExecutionResultsResponse|etc is returned
-                enable_pagination = any(key in api_response.attribute_map for key in pagination_params)
-                if hasattr(api_response, "entities") and api_response.entities:
-                    for item in api_response.entities:
-                        items.append(item)
+                if items_key is not None:
+                    # Cursor-paged results, e.g. of an analytics job
+                    enable_pagination = True
+                    items.extend(response_field(api_response, items_key) or [])
+                elif isinstance(api_response, list):
+                    # A simple list (of strings) is returned as response
+                    items.extend(api_response)
+                elif isinstance(api_response, dict):
+                    # Raw JSON: only listings carry the nextUri or cursor checked below
+                    enable_pagination = True
+                    if api_response.get("entities"):
+                        items.extend(api_response["entities"])
+                    else:
+                        items.append(api_response)
                 else:
-                    items.append(api_response)
+                    # An object such as EdgeEntityListing|RoutingStatus|AuditQueryExecutionResultsResponse|etc is returned
+                    enable_pagination = any(key in api_response.attribute_map for key in pagination_params)
+                    if hasattr(api_response, "entities") and api_response.entities:
+                        items.extend(api_response.entities)
+                    else:
+                        items.append(api_response)
 
-            if not enable_pagination:
-                break
-            if hasattr(api_response, "next_uri") and api_response.next_uri:
-                page_number += 1
-                kwargs["page_number"] = page_number
-            elif hasattr(api_response, "cursor") and api_response.cursor:
-                cursor = api_response.cursor
-                kwargs["cursor"] = cursor
-            else:
-                break
+                next_page = None
+                if enable_pagination:
+                    if response_field(api_response, "next_uri"):
+                        page_number += 1
+                        kwargs["page_number"] = page_number
+                        next_page = executor.submit(self._call, function, *args, **kwargs)
+                    elif response_field(api_response, "cursor"):
+                        cursor = response_field(api_response, "cursor")
+                        kwargs["cursor"] = cursor
+                        next_page = executor.submit(self._call, function, *args, **kwargs)
+
+                yield from items
 
-        return items
+    def _fetch(self, api_instance, f_name: str, *args, raw: bool = False, **kwargs):
+        return list(self._iter_fetch(api_instance, f_name, *args, raw=raw, **kwargs))
 
-    def get(self, api_instance_name: str, function_name: str, *args, **kwargs):
+    def _map_ordered(self, func: Callable, items: Iterable) -> Iterator:
+        """
+        Apply a function to every item through a bounded pool of workers.
+        At most max_concurrency calls are in flight at any time.
+        :param func: Function to be called with each item.
+        :param items: Items to be processed.
+        :return: Iterator over the results, in the same order as the items.
+        """
+        items = iter(items)
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            for item in islice(items, self.max_concurrency):
+                pending.append(executor.submit(func, item))
+            while pending:
+                result = pending.popleft().result()
+                for item in islice(items, 1):
+                    pending.append(executor.submit(func, item))
+                yield result
+
+    def _map_unordered(self, func: Callable, items: Iterable) -> Iterator:
+        """
+        Apply a function to every item through a bounded pool of workers.
+        At most max_concurrency calls are in flight at any time.
+        :param func: Function to be called with each item.
+        :param items: Items to be processed.
+        :return: Iterator over the results, as soon as each of them is available.
+        """
+        items = iter(items)
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            pending = {executor.submit(func, item) for item in islice(items, self.max_concurrency)}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    for item in islice(items, 1):
+                        pending.add(executor.submit(func, item))
+                    yield future.result()
+
+    def _handle_api_exception(self, e: ApiException, api_instance_name: str, function_name: str) -> None:
+        """
+        Log an exception returned by the API.
+        Rejected tokens are renewed by _call, which retries the request once with a new token.
+        """
+        if e.status == 429:
+            self.logger.warning(f"Rate limit still exceeded after {self.MAX_RETRIES} retries.")
+        err_message = f"Exception when calling {api_instance_name}->{function_name}:"
+        try:
+            body = json.loads(e.body)
+            message = body["message"]
+            self.logger.error(f"{err_message} [{e.status}] {e.reason} - {message}")
+        except ValueError as ve:
+            self.logger.warning(f"{err_message} {ve}")
+            self.logger.error(f"{err_message} [{e.status}] {e.reason} - {e.body}")
+
+    def get(self, api_instance_name: str, function_name: str, *args, raw: bool = False, **kwargs):
         """
         GET data from Genesys Cloud API
 
         :param api_instance_name: Name of the API instance e.g. TelephonyProvidersEdgeApi, RoutingApi, etc
         :param function_name: Name of the function to call in the API instance
+        :param raw: Return the parsed JSON body (dictionaries keyed by API field names) instead of SDK models.
         """
         self.logger.info(f"Getting data from {api_instance_name}->{function_name}")
         # Get the API class dynamically
@@ -156,28 +785,125 @@ class GenesysCloudClient:
         api_instance = api_class(self.client)
 
         try:
-            return self._fetch(api_instance, function_name, *args, **kwargs)
+            return self._fetch(api_instance, function_name, *args, raw=raw, **kwargs)
         except AttributeError as e:
             self.logger.error(f"Error: {e}")
         except ApiException as e:
-            if e.status == 429 and "Rate limit exceeded the maximum" in e.reason:
-                self.logger.warning("Rate limit exceeded. Refreshing token.")
-                self.client.handle_expired_access_token()
-            if e.status == 401 and "expir" in e.reason:
-                # Haven't hit this yet. Message to be confirmed
-                self.logger.warning("Token expired. Refreshing token.")
-                self.client.handle_expired_access_token()
-            err_message = f"Exception when calling {api_instance_name}->{function_name}:"
-            try:
-                body = json.loads(e.body)
-                message = body["message"]
-                self.logger.error(f"{err_message} [{e.status}] {e.reason} - {message}")
-            except ValueError as ve:
-                self.logger.warning(f"{err_message} {ve}")
-                self.logger.error(f"{err_message} [{e.status}] {e.reason} - {e.body}")
+            self._handle_api_exception(e, api_instance_name, function_name)
 
         return []
 
+    def iter_get(self, api_instance_name: str, function_name: str, *args, raw: bool = False,
+                 items_key: str = None, **kwargs) -> Iterator:
+        """
+        GET data from Genesys Cloud API, yielding entities page by page instead of
+        collecting all of them in memory.
+        Unlike get, API errors are raised once logged.
+
+        :param api_instance_name: Name of the API instance e.g. TelephonyProvidersEdgeApi, RoutingApi, etc
+        :param function_name: Name of the function to call in the API instance
+        :param raw: Yield the parsed JSON body (dictionaries keyed by API field names) instead of SDK models.
+        :param items_key: Field holding the items of cursor-paged responses (e.g. conversations), if not entities.
+        """
+        self.logger.info(f"Streaming data from {api_instance_name}->{function_name}")
+        # Get the API class dynamically
+        api_class = getattr(PureCloudPlatformClientV2, api_instance_name)
+
+        # Instantiate the API with the client
+        api_instance = api_class(self.client)
+
+        try:
+            yield from self._iter_fetch(api_instance, function_name, *args, raw=raw, items_key=items_key, **kwargs)
+        except AttributeError as e:
+            self.logger.error(f"Error: {e}")
+        except ApiException as e:
+            # Entities already yielded cannot be taken back: let the caller know the stream is incomplete
+            self._handle_api_exception(e, api_instance_name, function_name)
+            raise
+
+    def wait_for_job(self, api_instance_name: str, function_name: str, job_id: str, done_states: Iterable[str],
+                     max_polls: int = 10, poll_interval: float = 2.0, backoff: float = 1.0,
+                     max_interval: float = BACKOFF_MAX):
+        """
+        Poll the status of an asynchronous job (e.g. audit query, analytics details job) until
+        it reaches one of the done states or the number of polls is exhausted.
+
+        :param api_instance_name: Name of the API instance e.g. AuditApi, ConversationsApi, etc
+        :param function_name: Name of the function returning the status of the job
+        :param job_id: ID of the job (transaction ID of audit queries)
+        :param done_states: States after which the job no longer changes, e.g. Succeeded, Failed.
+        :param max_polls: Maximum number of status checks.
+        :param poll_interval: Seconds to wait before the second status check.
+        :param backoff: Factor applied to the wait after each check, 1 to wait the same time.
+        :param max_interval: Upper bound of the wait between checks, in seconds.
+        :return: Last status received, whose state is one of done_states unless polls are exhausted.
+        """
+        status = None
+        for attempt in range(max_polls):
+            if attempt:
+                time.sleep(min(poll_interval * backoff ** (attempt - 1), max_interval))
+            state_resp = self.get(api_instance_name, function_name, job_id)
+            if not state_resp:
+                raise Exception(f"Failed to get status for job {job_id}")
+            status = state_resp[0]
+            if response_field(status, "state") in done_states:
+                break
+        return status
+
+    def delete(self, api_instance_name: str, function_name: str, *args, **kwargs) -> bool:
+        """
+        Send a DELETE request to the Genesys Cloud API, e.g. to cancel an asynchronous job.
+
+        :param api_instance_name: Name of the API instance e.g. ConversationsApi
+        :param function_name: Name of the function to call in the API instance
+        :return: True if the request succeeded, errors being logged.
+        """
+        self.logger.info(f"Deleting with {api_instance_name}->{function_name}")
+        api_class = getattr(PureCloudPlatformClientV2, api_instance_name)
+        api_instance = api_class(self.client)
+
+        try:
+            self._call(getattr(api_instance, function_name), *args, **kwargs)
+            return True
+        except AttributeError as e:
+            self.logger.error(f"Error: {e}")
+        except ApiException as e:
+            self._handle_api_exception(e, api_instance_name, function_name)
+        return False
+
+    def get_many(self, api_instance_name: str, function_name: str, args_list: Iterable[tuple]) -> Iterator[list]:
+        """
+        Send several GET requests concurrently, e.g. one per batch of IDs.
+        Requests share the client rate limiter and at most max_concurrency of them are in flight.
+
+        :param api_instance_name: Name of the API instance e.g. TelephonyProvidersEdgeApi, RoutingApi, etc
+        :param function_name: Name of the function to call in the API instance
+        :param args_list: Positional arguments of each request.
+        :return: Iterator over the result of each request (see get), in order of arrival.
+        """
+        return self._map_unordered(
+            lambda args: self.get(api_instance_name, function_name, *args), args_list
+        )
+
+    def _stream(self, url: str, chunk_size: int) -> Iterator[bytes]:
+        """
+        Stream the body of a URL chunk by chunk.
+        :param url: URL to download.
+        :param chunk_size: Number of bytes to read per iteration.
+        """
+        response = self.pool.request("GET", url, preload_content=False)
+        try:
+            if response.status != 200:
+                raise urllib3.exceptions.HTTPError(f"Unexpected status: {response.status}")
+            for chunk in response.stream(chunk_size):
+                if chunk:
+                    yield chunk
+        finally:
+            # A fully read response has already given its connection back to the pool.
+            # Otherwise the connection is closed, as the rest of the body is not read, and its slot released.
+            response.close()
+            response.release_conn()
+
     def download(self, url: str, chunk_size: int = 8192) -> BytesIO:
         """
         Download a URL in chunks into an in-memory buffer.
@@ -185,28 +911,26 @@ class GenesysCloudClient:
         :param chunk_size: Number of bytes to read per iteration.
         :return: BytesIO buffer positioned at the start, containing the downloaded bytes.
         """
-        config = Configuration()
-        if config.proxy:
-            headers = None
-            if config.proxy_username and config.proxy_password:
-                headers = urllib3.make_headers(
-                    proxy_basic_auth=f"{config.proxy_username}:{config.proxy_password}"
-                )
-            http = urllib3.ProxyManager(config.proxy, proxy_headers=headers)
-        else:
-            http = urllib3.PoolManager()
-
         buffer = BytesIO()
-        with http.request("GET", url, preload_content=False) as response:
-            if response.status != 200:
-                raise urllib3.exceptions.HTTPError(f"Unexpected status: {response.status}")
-            for chunk in response.stream(chunk_size):
-                if chunk:
-                    buffer.write(chunk)
+        for chunk in self._stream(url, chunk_size):
+            buffer.write(chunk)
 
         buffer.seek(0)  # rewind so the buffer can be read from the start
         return buffer
 
+    def iter_download(self, url: str, chunk_size: int = 8192) -> Iterator[JsonRecord]:
+        """
+        Download a JSON array, yielding its elements as soon as they are received.
+        Memory is bounded by the chunk size and the largest element, whatever the size of the file.
+        :param url: URL to download events from.
+        :param chunk_size: Number of bytes to read per iteration.
+        :return: Iterator over the JSON text of each element, see JsonArraySplitter.
+        """
+        splitter = JsonArraySplitter()
+        for chunk in self._stream(url, chunk_size):
+            yield from splitter.feed(chunk)
+        yield from splitter.close()
+
     def convert_response(self, response: list, key: str) -> list:
         """
         Convert data returned from paginating POST API.
@@ -221,21 +945,18 @@ class GenesysCloudClient:
                 total_items.extend(res_dict.get(key, []) or [])
         return total_items
 
-    def post(self, api_instance_name: str, function_name: str, model_name: str, body: dict, *args, **kwargs):
+    def _prepare_post(self, api_instance_name: str, function_name: str, model_name: str, body: dict):
         """
-        Sends a POST request to the Genesys Cloud API.
+        Resolve the API function and build the request model for a POST request.
 
         :param api_instance_name: Name of the API instance, e.g., 'FlowsApi'.
         :param function_name: Name of the function to call in the API instance.
         :param model_name: Name of the data model corresponding to the request body.
         :param body: Dictionary representing the request body.
+        :return: Tuple (function, model instance, pagination enabled) or None if it cannot be resolved.
         """
         enable_pagination = False
-        api_responses = []
-        # Typically 100 items per page is the max accepted
-        page_size = 100
         page_number = 1
-        total_hits = 0
 
         # Dynamically get the API class
         api_class = getattr(PureCloudPlatformClientV2, api_instance_name, None)
@@ -266,14 +987,14 @@ class GenesysCloudClient:
         if "paging" in model_instance.attribute_map:
             self.logger.debug(f"Enabling pagination for {function_name} - {model_name}")
             body["paging"] = {
-                "pageSize": page_size,
+                "pageSize": self.POST_PAGE_SIZE,
                 "pageNumber": page_number
             }
             enable_pagination = True
 
         if "page_size" in model_instance.attribute_map:
             self.logger.debug(f"Enabling pagination for {function_name} - {model_name}")
-            body["page_size"] = page_size
+            body["page_size"] = self.POST_PAGE_SIZE
             body["page_number"] = page_number
             enable_pagination = True
 
@@ -288,48 +1009,189 @@ class GenesysCloudClient:
             else:
                 self.logger.debug(f"The model '{model_name}' does not have a method '{key}'")
 
+        return function, model_instance, enable_pagination
+
+    def _iter_post_pages(self, function, model_instance, *args, **kwargs) -> Iterator:
+        """
+        Iterate over the pages returned by a paginated POST request.
+        Once the first page reveals the total, the remaining pages are fetched concurrently
+        and yielded in page order.
+        """
+        page_number = 1
+
+        def fetch_page(number: int):
+            # Each worker gets its own copy of the model so page numbers are not overwritten
+            page_model = copy.deepcopy(model_instance)
+            if "paging" in page_model.attribute_map:
+                page_model.paging["pageNumber"] = number
+            else:
+                page_model.page_number = number
+            return self._call(function, page_model, *args, **kwargs)
+
+        api_response = self._call(function, model_instance, *args, **kwargs)
+        if isinstance(api_response, dict):
+            # Raw JSON omits the fields without value, e.g. totalHits when nothing matched
+            total_hits = api_response.get("totalHits", api_response.get("total"))
+        elif "total_hits" not in api_response.attribute_map:
+            try:
+                total_hits = api_response.total
+            except Exception as e:
+                self.logger.error(f"Pagination enabled but neither 'total_hits' nor 'total' is returned: {api_response.attribute_map}")
+                return
+        else:
+            total_hits = api_response.total_hits
+        yield api_response
+
+        total_pages = math.ceil((total_hits or 0) / self.POST_PAGE_SIZE)
+        if total_pages > page_number:
+            self.logger.debug(f"Fetching {total_pages - page_number} more pages with up to {self.max_concurrency} concurrent requests")
+            yield from self._map_ordered(fetch_page, range(page_number + 1, total_pages + 1))
+
+    def post(self, api_instance_name: str, function_name: str, model_name: str, body: dict, *args, raw: bool = False, **kwargs):
+        """
+        Sends a POST request to the Genesys Cloud API.
+
+        :param api_instance_name: Name of the API instance, e.g., 'FlowsApi'.
+        :param function_name: Name of the function to call in the API instance.
+        :param model_name: Name of the data model corresponding to the request body.
+        :param body: Dictionary representing the request body.
+        :param raw: Return the parsed JSON body (dictionaries keyed by API field names) instead of SDK models.
+        """
+        prepared = self._prepare_post(api_instance_name, function_name, model_name, body)
+        if prepared is None:
+            return None
+        function, model_instance, enable_pagination = prepared
+        if raw:
+            function = self._as_raw(function)
+
         try:
             # Call the function with the model instance and additional arguments
-            while True:
-                api_response = function(model_instance, *args, **kwargs)
-                api_responses.append(api_response)
+            if not enable_pagination:
+                return self._call(function, model_instance, *args, **kwargs)
+            return list(self._iter_post_pages(function, model_instance, *args, **kwargs)) or None
 
-                if enable_pagination:
-                    if "total_hits" not in api_response.attribute_map:
-                        try:
-                            total_hits = api_response.total
-                        except Exception as e:
-                            self.logger.error(f"Pagination enabled but neither 'total_hits' nor 'total' is returned: {api_response.attribute_map}")
-                            return None
-                    else:
-                        total_hits = api_response.total_hits
+        except ApiException as e:
+            self._handle_api_exception(e, api_instance_name, function_name)
+            return None
 
-                    if total_hits - (page_size * page_number) > 0:
-                        page_number += 1
-                        if "paging" in model_instance.attribute_map:
-                            model_instance.paging["pageNumber"] = page_number
-                        else:
-                            model_instance.page_number = page_number
-                        continue
-                    break
-                return api_response
-            return api_responses
+    def post_total(self, api_instance_name: str, function_name: str, model_name: str, body: dict) -> int:
+        """
+        Get the number of items matched by a paginated POST query, requesting a single item.
+        Unlike post, API errors are raised once logged.
 
+        :param api_instance_name: Name of the API instance, e.g., 'ConversationsApi'.
+        :param function_name: Name of the function to call in the API instance.
+        :param model_name: Name of the data model corresponding to the request body.
+        :param body: Dictionary representing the request body.
+        :return: Total number of items (totalHits or total of the response).
+        """
+        prepared = self._prepare_post(api_instance_name, function_name, model_name, body)
+        if prepared is None:
+            raise ValueError(f"Cannot query {api_instance_name}.{function_name}")
+        function, model_instance, enable_pagination = prepared
+        if not enable_pagination:
+            raise ValueError(f"{api_instance_name}.{function_name} is not paginated")
+        if "paging" in model_instance.attribute_map:
+            model_instance.paging["pageSize"] = 1
+        else:
+            model_instance.page_size = 1
+
+        try:
+            api_response = self._call(self._as_raw(function), model_instance) or {}
         except ApiException as e:
-            if e.status == 429 and "Rate limit exceeded the maximum" in e.reason:
-                self.logger.warning("Rate limit exceeded. Refreshing token.")
-                self.client.handle_expired_access_token()
-            if e.status == 401 and "expir" in e.reason:
-                # Haven't hit this yet. Message to be confirmed
-                self.logger.warning("Token expired. Refreshing token.")
-                self.client.handle_expired_access_token()
-            err_message = f"Exception when calling {api_instance_name}->{function_name}:"
-            try:
-                body = json.loads(e.body)
-                message = body["message"]
-                self.logger.error(f"{err_message} [{e.status}] {e.reason} - {message}")
-            except ValueError as ve:
-                self.logger.warning(f"{err_message} {ve}")
-                self.logger.error(f"{err_message} [{e.status}] {e.reason} - {e.body}")
+            self._handle_api_exception(e, api_instance_name, function_name)
+            raise
+        return api_response.get("totalHits", api_response.get("total")) or 0
+
+    def post_totals(self, api_instance_name: str, function_name: str, model_name: str,
+                    bodies: Iterable[dict]) -> Iterator[int]:
+        """
+        Get the number of items matched by several paginated POST queries, sent concurrently.
+        See post_total.
+
+        :param api_instance_name: Name of the API instance, e.g., 'ConversationsApi'.
+        :param function_name: Name of the function to call in the API instance.
+        :param model_name: Name of the data model corresponding to the request body.
+        :param bodies: Dictionaries representing the body of each query.
+        :return: Iterator over the total of each query, in the same order as the bodies.
+        """
+        return self._map_ordered(
+            lambda body: self.post_total(api_instance_name, function_name, model_name, body), bodies
+        )
+
+    def post_many(self, api_instance_name: str, function_name: str, model_name: str, bodies: Iterable[dict]) -> Iterator:
+        """
+        Send several POST requests concurrently, e.g. one per batch of IDs.
+        Requests share the client rate limiter and at most max_concurrency of them are in flight.
+
+        :param api_instance_name: Name of the API instance, e.g., 'FlowsApi'.
+        :param function_name: Name of the function to call in the API instance.
+        :param model_name: Name of the data model corresponding to the request body.
+        :param bodies: Dictionaries representing the body of each request.
+        :return: Iterator over the response of each request (see post), in order of arrival.
+        """
+        return self._map_unordered(
+            lambda body: self.post(api_instance_name, function_name, model_name, body), bodies
+        )
+
+    def iter_post_many(self, api_instance_name: str, function_name: str, model_name: str,
+                       tagged_bodies: Iterable[tuple], key: str, raw: bool = False) -> Iterator[tuple]:
+        """
+        Send several paginated POST queries concurrently, e.g. one per time window, collecting
+        the items of all the pages of each query.
+        At most max_concurrency queries are in flight, and their pages are fetched as in iter_post.
+        API errors are raised once logged.
+
+        :param api_instance_name: Name of the API instance, e.g., 'ConversationsApi'.
+        :param function_name: Name of the function to call in the API instance.
+        :param model_name: Name of the data model corresponding to the request body.
+        :param tagged_bodies: Tuples (tag, body), the tag identifying the query in the results.
+        :param key: key of the list of items to be returned (e.g. results, conversations).
+        :param raw: Collect the items parsed from the JSON body, see iter_post.
+        :return: Iterator over tuples (tag, list of items), as soon as each query is complete.
+        """
+        def collect(tagged_body: tuple) -> tuple:
+            tag, body = tagged_body
+            return tag, list(self.iter_post(api_instance_name, function_name, model_name, body, key, raw=raw))
+
+        return self._map_unordered(collect, tagged_bodies)
+
+    def iter_post(self, api_instance_name: str, function_name: str, model_name: str, body: dict, key: str, *args,
+                  raw: bool = False, **kwargs) -> Iterator:
+        """
+        Sends a POST request to the Genesys Cloud API, yielding the items of each page
+        as soon as it is received instead of collecting every page in memory.
+        Unlike post, API errors are raised once logged.
+
+        :param api_instance_name: Name of the API instance, e.g., 'FlowsApi'.
+        :param function_name: Name of the function to call in the API instance.
+        :param model_name: Name of the data model corresponding to the request body.
+        :param body: Dictionary representing the request body.
+        :param key: key of the list of items to be returned (e.g. results, conversations).
+        :param raw: Yield the items parsed from the JSON body, keyed by API field names,
+            instead of converting SDK models with to_dict().
+        """
+        prepared = self._prepare_post(api_instance_name, function_name, model_name, body)
+        if prepared is None:
+            return
+        function, model_instance, enable_pagination = prepared
+        if raw:
+            function = self._as_raw(function)
+
+        try:
+            if enable_pagination:
+                pages = self._iter_post_pages(function, model_instance, *args, **kwargs)
+            else:
+                pages = iter([self._call(function, model_instance, *args, **kwargs)])
+            for api_response in pages:
+                if raw:
+                    yield from response_field(api_response or {}, key) or []
+                    continue
+                res_dict = api_response.to_dict() or {}
+                yield from res_dict.get(key, []) or []
+
+        except ApiException as e:
+            # Items already yielded cannot be taken back: let the caller know the stream is incomplete
+            self._handle_api_exception(e, api_instance_name, function_name)
+            raise
 
-            return None
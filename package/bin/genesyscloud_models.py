@@ -1,8 +1,9 @@
 import re
 import datetime
+import hashlib
 import json
 
-from typing import List, Tuple
+from typing import Dict, Iterable, Iterator, List, Tuple, Union
 from PureCloudPlatformClientV2.models import (
     Edge,
     Phone,
@@ -11,9 +12,102 @@ from PureCloudPlatformClientV2.models import (
     User
 )
 
+class ReadOnlyDict(dict):
+    """ Dictionary shared between events: serializable as a plain dict but not mutable """
+    def _readonly(self, *args, **kwargs):
+        raise TypeError(f"{type(self).__name__} does not support item assignment")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __reduce__(self):
+        return type(self), (dict(self),)
+
+
+def freeze(value):
+    """
+    Recursively convert a value to its read-only counterpart.
+    :param value: Dictionary, list or scalar value.
+    :return: ReadOnlyDict for dictionaries, tuple for lists, the value itself otherwise.
+    """
+    if isinstance(value, dict):
+        return ReadOnlyDict((k, freeze(v)) for k, v in value.items())
+    if isinstance(value, list):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
 class GCBaseModel:
-    def __init__(self, data: List[dict]) -> None:
-        self.data = data
+    REQUIRED_KEYS: List[str] = []
+
+    def __init__(self, data: Iterable[Union[dict, object]]) -> None:
+        # Records are kept as received, SDK objects or dictionaries, and only
+        # the fields needed by the enrichments are converted on first lookup.
+        self.data = list(data)
+        self.ids = [self.get_field(item, "id") for item in self.data]
+        # Index built once so that lookups by id do not scan the whole data set.
+        # The first occurrence wins, as with a linear scan.
+        self.data_by_id = {}
+        for item_id, item in zip(self.ids, self.data):
+            self.data_by_id.setdefault(item_id, item)
+        # Projections are computed on first lookup and shared by all the events
+        # enriched with the same entity afterwards.
+        self.projections = {}
+
+    @staticmethod
+    def has_field(item: Union[dict, object], key: str) -> bool:
+        return key in item if isinstance(item, dict) else hasattr(item, key)
+
+    @staticmethod
+    def get_field(item: Union[dict, object], key: str):
+        return item.get(key) if isinstance(item, dict) else getattr(item, key, None)
+
+    @classmethod
+    def to_plain(cls, value):
+        """
+        Convert a field value to plain dictionaries and lists.
+        Only the given value is walked, not the whole record it belongs to.
+        """
+        if isinstance(value, list):
+            return [cls.to_plain(v) for v in value]
+        if isinstance(value, dict):
+            return {k: cls.to_plain(v) for k, v in value.items()}
+        if hasattr(value, "to_dict"):
+            return value.to_dict()
+        return value
+
+    @classmethod
+    def select(cls, item: Union[dict, object], keys: List[str]) -> dict:
+        """
+        Extract specific fields from a record without converting the rest of it.
+        :param item: SDK object or dictionary.
+        :param keys: List of keys to extract.
+        :return: A new dictionary containing the extracted key-value pairs.
+        """
+        return {k: cls.to_plain(cls.get_field(item, k)) for k in keys if cls.has_field(item, k)}
+
+    def project(self, item: Union[dict, object]) -> dict:
+        """
+        Select the fields of a record added to the enriched events.
+        :param item: The record.
+        :return: A new dictionary containing the REQUIRED_KEYS of the record.
+        """
+        return self.select(item, self.REQUIRED_KEYS)
+
+    def get_projection(self, item_id: str, entity: str) -> dict:
+        """
+        Get the cached projection of a record.
+        :param item_id: ID of the record.
+        :param entity: Entity name used in the error message.
+        :return: A read-only dictionary, the same instance for every call with the same ID.
+        """
+        projection = self.projections.get(item_id)
+        if projection is None:
+            item = self.data_by_id.get(item_id)
+            if item is None:
+                raise ValueError(f"{entity} {item_id} not found")
+            projection = self.projections[item_id] = freeze(self.project(item))
+        return projection
 
     def to_camelcase(self, s: str) -> str:
         return re.sub(r'(?!^)_([a-zA-Z])', lambda m: m.group(1).upper(), s)
@@ -22,7 +116,8 @@ class GCBaseModel:
         formatting_str = "%d-%m-%YT%H:%M:%S.%f%z"
         return dt.strftime(formatting_str)
 
-    def to_datetime(self, dt_string: str) -> datetime:
+    @staticmethod
+    def to_datetime(dt_string: str) -> datetime:
         formatting_str = "%Y-%m-%dT%H:%M:%S.%fZ"
         return datetime.datetime.strptime(dt_string, formatting_str)
 
@@ -35,10 +130,10 @@ class GCBaseModel:
         :param enable_camelcase: Enable key format to camelcase.
         :return: A new dictionary containing the extracted key-value pairs.
         """
-        if sub_key not in self.data[idx] or not isinstance(self.data[idx][sub_key], dict):
+        sub_dict = self.to_plain(self.get_field(self.data[idx], sub_key))
+        if not isinstance(sub_dict, dict):
             raise ValueError(f"Key '{sub_key}' not found or is not a dictionary")
 
-        sub_dict = self.data[idx][sub_key]
         sub_key_cc = self.to_camelcase(sub_key) if enable_camelcase else sub_key
         return {
             f"{sub_key_cc}{key.capitalize()}" if enable_camelcase else f"{sub_key}_{key}": sub_dict[key] for key in keys_to_extract if key in sub_dict
@@ -47,162 +142,183 @@ class GCBaseModel:
 
 class TrunkModel(GCBaseModel):
     MAX_TRUNK_IDS: int = 100
+    REQUIRED_KEYS: List[str] = [
+        "id", "name", "date_created", "date_modified", "state",
+        "trunk_type", "edge", "trunk_base", "in_service", "enabled",
+        "connected_status", "ip_status"
+    ]
 
-    def __init__(self, trunks: List[Trunk]) -> None:
-        lst_trunks = []
-        for trunk in trunks:
-            lst_trunks.append(trunk.to_dict())
-        super().__init__(lst_trunks)
+    def __init__(self, trunks: Iterable[Trunk]) -> None:
+        super().__init__(trunks)
 
     @property
     def trunk_ids(self) -> List[str]:
-        return [trunk["id"] for trunk in self.data]
+        return list(self.ids)
 
     def get_trunk_ids(self, batch: int = 0) -> Tuple[List[str], bool]:
         factor = self.MAX_TRUNK_IDS * batch
         slice_limit = self.MAX_TRUNK_IDS + factor
         remaining_trunks = abs(len(self.data) - factor)
         has_next_batch = remaining_trunks > self.MAX_TRUNK_IDS
-        return [trunk["id"] for trunk in self.data[factor:slice_limit]], has_next_batch
+        return self.ids[factor:slice_limit], has_next_batch
 
     def get_trunk(self, tid: str) -> dict:
-        ret_trunk = {}
-        required_keys = [
-            "id", "name", "date_created", "date_modified", "state",
-            "trunk_type", "edge", "trunk_base", "in_service", "enabled",
-            "connected_status", "ip_status"
-        ]
-
-        trunk = next((t for t in self.data if t["id"] == tid), None)
-        if trunk is None:
-            raise ValueError(f"Trunk {tid} not found")
-        ret_trunk.update({k: trunk[k] for k in required_keys if k in trunk})
-        return ret_trunk
+        return self.get_projection(tid, "Trunk")
 
 
 class EdgeModel(GCBaseModel):
     MAX_EDGE_IDS: int = 100
+    REQUIRED_KEYS: List[str] = [
+        "id", "name", "version", "description", "date_created", "date_modified",
+        "state", "interfaces", "online_status",
+        "serial_number", "physical_edge", "edge_deployment_type",
+        "conversation_count", "os_name"
+    ]
 
-    def __init__(self, edges: List[Edge]):
-        lst_edges = []
-        for e in edges:
-            lst_edges.append(e.to_dict())
-        super().__init__(lst_edges)
+    def __init__(self, edges: Iterable[Edge]) -> None:
+        super().__init__(edges)
 
     def get_edge_ids(self, batch: int = 0) -> Tuple[List[str], bool]:
         factor = self.MAX_EDGE_IDS*batch
         slice_limit = self.MAX_EDGE_IDS + factor
         remaining_edges = abs(len(self.data) - factor)
         has_next_batch = remaining_edges > self.MAX_EDGE_IDS
-        return [edge["id"] for edge in self.data[factor:slice_limit]], has_next_batch
+        return self.ids[factor:slice_limit], has_next_batch
 
-    def get_edge(self, eid: str) -> dict:
+    def project(self, item: Union[dict, Edge]) -> dict:
         ret_edge = { "site": {} }
-        required_keys = [
-            "id", "name", "version", "description", "date_created", "date_modified",
-            "state", "interfaces", "online_status",
-            "serial_number", "physical_edge", "edge_deployment_type",
-            "conversation_count", "os_name"
-        ]
-
-        edge = next((e for e in self.data if e["id"] == eid), None)
-        if edge is None:
-            raise ValueError(f"Edge {eid} not found")
-        ret_edge.update({k: edge[k] for k in required_keys if k in edge})
+        ret_edge.update(super().project(item))
         # Avoid indexing a lot of "null" values added
         # by the to_dict() SDK function for "site" data
-        for key, value in edge["site"].items():
-            if key in ["id", "name", "state"]:
-                ret_edge["site"][key] = value
+        ret_edge["site"].update(self.select(self.get_field(item, "site"), ["id", "name", "state"]))
         return ret_edge
 
+    def get_edge(self, eid: str) -> dict:
+        return self.get_projection(eid, "Edge")
+
 
 class PhoneModel(GCBaseModel):
-    def __init__(self, phones: List[Phone]) -> None:
-        lst_phones = []
-        for phone in phones:
-            lst_phones.append(phone.to_dict())
-        super().__init__(lst_phones)
+    STATUS_TYPES: List[str] = ["status", "secondary_status"]
+    # Phone fields added to each status
+    PHONE_KEYS: List[str] = ["name", "date_created", "date_modified", "state", "site"]
+    # Status fields updated without the state of the phone changing, left out of the digests
+    VOLATILE_STATUS_KEYS: List[str] = ["event_creation_time"]
+
+    def __init__(self, phones: Iterable[Phone]) -> None:
+        super().__init__(phones)
 
     @property
     def statuses(self) -> List[dict]:
         statuses = []
         for phone in self.data:
-            statuses.append(phone["status"])
-            statuses.append(phone["secondary_status"])
+            statuses.append(self.to_plain(self.get_field(phone, "status")))
+            statuses.append(self.to_plain(self.get_field(phone, "secondary_status")))
         return statuses
 
     @property
     def extended_statuses(self) -> List[dict]:
         """ Returning statuses augmented with phones info """
         statuses = []
-        required_keys = ["name", "date_created", "date_modified", "state", "site"]
         for phone in self.data:
-            for s_type in ["status", "secondary_status"]:
-                new_status = phone[s_type]
-                for key, value in phone.items():
-                    new_status.update({k: phone[k] for k in required_keys})
-                statuses.append(new_status)
+            statuses.extend(self.extend_statuses(phone))
+        return statuses
+
+    @classmethod
+    def extend_statuses(cls, phone: Union[dict, Phone]) -> List[dict]:
+        """ Returning the statuses of a single phone augmented with its info """
+        statuses = []
+        for s_type in cls.STATUS_TYPES:
+            new_status = cls.to_plain(cls.get_field(phone, s_type))
+            new_status.update(cls.select(phone, cls.PHONE_KEYS))
+            statuses.append(new_status)
         return statuses
 
+    @classmethod
+    def iter_extended_statuses(cls, phones: Iterable[Phone]) -> Iterator[dict]:
+        """ Yielding augmented statuses without holding all the phones in memory """
+        for phone in phones:
+            yield from cls.extend_statuses(phone)
+
+    @classmethod
+    def status_digest(cls, status: dict) -> str:
+        """ Returning a short digest of the state reported by a status """
+        state = {k: v for k, v in (status or {}).items() if k not in cls.VOLATILE_STATUS_KEYS}
+        return hashlib.blake2b(
+            json.dumps(state, sort_keys=True, default=str).encode("utf-8"), digest_size=8
+        ).hexdigest()
+
+    @classmethod
+    def iter_changed_statuses(cls, phones: Iterable[Phone], previous: Dict[str, List[str]],
+                              current: Dict[str, List[str]], since: float) -> Iterator[dict]:
+        """
+        Yielding the augmented statuses whose state changed since the previous run.
+        Phones without a previous digest, e.g. on the first run, yield the statuses created after since.
+        :param phones: Phones with their statuses.
+        :param previous: Digests of the previous run, by phone ID.
+        :param current: Filled with the digests of this run, by phone ID.
+        :param since: Epoch time used for the phones without a previous digest.
+        """
+        for phone in phones:
+            digests = previous.get(cls.get_field(phone, "id"))
+            new_digests = current[cls.get_field(phone, "id")] = []
+            phone_fields = None
+            for i, s_type in enumerate(cls.STATUS_TYPES):
+                status = cls.to_plain(cls.get_field(phone, s_type))
+                digest = cls.status_digest(status)
+                new_digests.append(digest)
+                if not status:
+                    continue
+                if digests is None:
+                    changed = cls.to_datetime(status["event_creation_time"]).timestamp() > since
+                else:
+                    changed = digests[i] != digest
+                if changed:
+                    # Phone fields are only selected for the phones emitted
+                    if phone_fields is None:
+                        phone_fields = cls.select(phone, cls.PHONE_KEYS)
+                    status.update(phone_fields)
+                    yield status
+
 
 class QueueModel(GCBaseModel):
     MAX_QUEUE_IDS: int = 200
+    REQUIRED_KEYS: List[str] = ["id", "name"]
 
-    def __init__(self, queues: List[Queue]) -> None:
-        lst_queues = []
-        for queue in queues:
-            lst_queues.append(queue.to_dict())
-        super().__init__(lst_queues)
+    def __init__(self, queues: Iterable[Queue]) -> None:
+        super().__init__(queues)
 
     @property
     def queue_ids(self) -> List[str]:
-        return [queue["id"] for queue in self.data]
+        return list(self.ids)
 
     def get_queue_ids(self, batch: int = 0) -> Tuple[List[str], bool]:
         factor = self.MAX_QUEUE_IDS*batch
         slice_limit = self.MAX_QUEUE_IDS + factor
         remaining_queues = abs(len(self.data) - factor)
         has_next_batch = remaining_queues > self.MAX_QUEUE_IDS
-        return [queue["id"] for queue in self.data[factor:slice_limit]], has_next_batch
+        return self.ids[factor:slice_limit], has_next_batch
 
     def get_queue(self, qid: str) -> dict:
-        ret_queue = {}
-        required_keys = ["id", "name"]
-
-        queue = next((q for q in self.data if q["id"] == qid), None)
-        if queue is None:
-            raise ValueError(f"Queue {qid} not found")
-        ret_queue.update({k: queue[k] for k in required_keys if k in queue})
-        return ret_queue
+        return self.get_projection(qid, "Queue")
 
 
 class UserModel(GCBaseModel):
     MAX_USER_IDS: int = 100
+    REQUIRED_KEYS: List[str] = ["id", "name", "chat", "email", "division"]
 
-    def __init__(self, users: List[User]) -> None:
-        lst_users = []
-        for user in users:
-            lst_users.append(user.to_dict())
-        super().__init__(lst_users)
+    def __init__(self, users: Iterable[User]) -> None:
+        super().__init__(users)
 
     @property
     def user_ids(self) -> List[str]:
-        return [user["id"] for user in self.data]
+        return list(self.ids)
 
     def get_user_ids(self, batch: int = 0) -> Tuple[List[str], bool]:
         factor = self.MAX_USER_IDS*batch
         slice_limit = self.MAX_USER_IDS + factor
         remaining_users = abs(len(self.data) - factor)
         has_next_batch = remaining_users > self.MAX_USER_IDS
-        return [user["id"] for user in self.data[factor:slice_limit]], has_next_batch
+        return self.ids[factor:slice_limit], has_next_batch
 
     def get_user(self, uid: str) -> dict:
-        ret_user = {}
-        required_keys = ["id", "name", "chat", "email", "division"]
-
-        user = next((u for u in self.data if u["id"] == uid), None)
-        if user is None:
-            raise ValueError(f"User {uid} not found")
-        ret_user.update({k: user[k] for k in required_keys if k in user})
-        return ret_user
\ No newline at end of file
+        return self.get_projection(uid, "User")
\ No newline at end of file
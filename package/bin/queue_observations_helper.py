@@ -2,11 +2,11 @@ import json
 import logging
 
 import import_declare_test
-from solnlib import conf_manager, log
-from solnlib.conf_manager import InvalidHostnameError, InvalidPortError
+from solnlib import log
 from splunklib import modularinput as smi
 
 from genesyscloud_client import GenesysCloudClient
+from genesyscloud_cache import ConfigCache, EntityCache, ResponseCache, TokenCache
 from genesyscloud_models import QueueModel
 
 ADDON_NAME = "genesys_cloud_ta"
@@ -14,15 +14,6 @@ ADDON_NAME = "genesys_cloud_ta"
 def logger_for_input(input_name: str) -> logging.Logger:
     return log.Logs().get_logger(f"{ADDON_NAME.lower()}_{input_name}")
 
-def get_account_property(session_key: str, account_name: str, property_name: str):
-    cfm = conf_manager.ConfManager(
-        session_key,
-        ADDON_NAME,
-        realm=f"__REST_CREDENTIAL__#{ADDON_NAME}#configs/conf-genesys_cloud_ta_account",
-    )
-    account_conf_file = cfm.get_conf("genesys_cloud_ta_account")
-    return account_conf_file.get(account_name).get(property_name)
-
 def validate_input(definition: smi.ValidationDefinition):
     return
 
@@ -32,53 +23,41 @@ def stream_events(inputs: smi.InputDefinition, event_writer: smi.EventWriter):
         logger = logger_for_input(normalized_input_name)
         try:
             session_key = inputs.metadata["session_key"]
-            log_level = conf_manager.get_log_level(
-                logger=logger,
-                session_key=session_key,
-                app_name=ADDON_NAME,
-                conf_name="genesys_cloud_ta_settings",
-            )
-            logger.setLevel(log_level)
-            try:
-                proxy_config = conf_manager.get_proxy_dict(
-                    logger=logger,
-                    session_key=session_key,
-                    app_name=ADDON_NAME,
-                    conf_name="genesys_cloud_ta_settings",
-                )
-            # Handle invalid port case
-            except InvalidPortError as e:
-                logger.error(f"Proxy configuration error: {e}")
-
-            # Handle invalid hostname case
-            except InvalidHostnameError as e:
-                logger.error(f"Proxy configuration error: {e}")
+            logger.setLevel(ConfigCache.get_log_level(logger, session_key))
+            proxy_config = ConfigCache.get_proxy_dict(logger, session_key)
             log.modular_input_start(logger, normalized_input_name)
 
-            client_id = get_account_property(session_key, input_item.get("account"), "client_id")
-            client_secret = get_account_property(session_key, input_item.get("account"), "client_secret")
-            account_region = get_account_property(session_key, input_item.get("account"), "region")
+            account_config = ConfigCache.get_account(session_key, input_item.get("account"))
+            client_id = account_config.get("client_id")
+            client_secret = account_config.get("client_secret")
+            account_region = account_config.get("region")
+            max_concurrency = account_config.get("max_concurrency")
             # Initialize Genesys Cloud client
             client = GenesysCloudClient(
-                logger, client_id, client_secret, account_region, proxy_config
+                logger, client_id, client_secret, account_region, proxy_config, max_concurrency,
+                token_cache=TokenCache(logger, session_key),
+                response_cache=ResponseCache(logger)
+            )
+            entity_cache = EntityCache(
+                logger, input_item.get("account"), account_config.get("inventory_cache_ttl")
             )
 
             # Getting data from API
             logger.info("Getting data from queues endpoint")
-            queue_model = QueueModel(
-                client.get(
+            queue_model = entity_cache.load(
+                QueueModel, "queues", lambda: client.iter_get(
                     "RoutingApi", "get_routing_queues"
                 )
             )
 
             # Getting metrics
             # Max 200 query predicates according to error received
-            results = []
+            bodies = []
             cnt = 0
             has_more = True
             while has_more:
                 queue_ids, has_more = queue_model.get_queue_ids(cnt)
-                body = {
+                bodies.append({
                     "filter": {
                         "type": "or",
                         "clauses": [],
@@ -95,34 +74,38 @@ def stream_events(inputs: smi.InputDefinition, event_writer: smi.EventWriter):
                         "oMemberUsers", "oOffQueueUsers", "oOnQueueUsers",
                         "oUserPresences", "oUserRoutingStatuses", "oWaiting"
                     ]
-                }
-                response = client.post(
-                    "RoutingApi",
-                    "post_analytics_queues_observations_query",
-                    "QueueObservationQuery",
-                    body
-                )
-                # Ensure data exists before processing
-                if response:
-                    res_dict = response.to_dict() or {}
-                    results.extend(res_dict.get("results", []) or [])
+                })
                 cnt += 1
-            logger.debug(f"Fetched '{len(results)}' queues observations")
 
+            # Chunks are requested concurrently and written as soon as each of them returns
             sourcetype = "genesyscloud:analytics:queues:observations"
+            result_counter = 0
             event_counter = 0
-            for item in results:
-                for data_entry in item["data"]:
-                    data_entry["queue"] = queue_model.get_queue(item["group"]["queueId"])
-                    event_writer.write_event(
-                        smi.Event(
-                            # Index time not needed?
-                            data=json.dumps(data_entry, ensure_ascii=False, default=str),
-                            index=input_item.get("index"),
-                            sourcetype=sourcetype
+            for response in client.post_many(
+                "RoutingApi",
+                "post_analytics_queues_observations_query",
+                "QueueObservationQuery",
+                bodies
+            ):
+                # Ensure data exists before processing
+                if not response:
+                    continue
+                res_dict = response.to_dict() or {}
+                results = res_dict.get("results", []) or []
+                result_counter += len(results)
+                for item in results:
+                    for data_entry in item["data"]:
+                        data_entry["queue"] = queue_model.get_queue(item["group"]["queueId"])
+                        event_writer.write_event(
+                            smi.Event(
+                                # Index time not needed?
+                                data=json.dumps(data_entry, ensure_ascii=False, default=str),
+                                index=input_item.get("index"),
+                                sourcetype=sourcetype
+                            )
                         )
-                    )
-                    event_counter += 1
+                        event_counter += 1
+            logger.debug(f"Fetched '{result_counter}' queues observations")
 
             # Checkpointing not needed?
             logger.debug(f"Indexed '{event_counter}' events")
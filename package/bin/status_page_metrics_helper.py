@@ -1,15 +1,15 @@
 import json
 import logging
-import requests
+import urllib3
 
 import import_declare_test
-from solnlib import conf_manager, log
-from solnlib.conf_manager import InvalidHostnameError, InvalidPortError
+from solnlib import log
 from splunklib import modularinput as smi
 from solnlib.modular_input import checkpointer
 
 from datetime import datetime, timezone
-from genesyscloud_client import ProxyHandler
+from genesyscloud_cache import ConfigCache, ResponseCache
+from genesyscloud_client import ConnectionPool, ProxyHandler
 
 
 ADDON_NAME = "genesys_cloud_ta"
@@ -21,30 +21,38 @@ def logger_for_input(input_name: str) -> logging.Logger:
 def validate_input(definition: smi.ValidationDefinition):
     return
 
-def get_account_property(session_key: str, account_name: str, property_name: str):
-    cfm = conf_manager.ConfManager(
-        session_key,
-        ADDON_NAME,
-        realm=f"__REST_CREDENTIAL__#{ADDON_NAME}#configs/conf-genesys_cloud_ta_account",
-    )
-    account_conf_file = cfm.get_conf("genesys_cloud_ta_account")
-    return account_conf_file.get(account_name).get(property_name)
-
-
-def fetch_status_page_data(logger: logging.Logger, proxy_url: str = None):
+def fetch_status_page_data(logger: logging.Logger, proxy: ProxyHandler = None, response_cache: ResponseCache = None):
     """Fetch status data from the Genesys Cloud Status Page API"""
     try:
         # Get status summary instead of incidents
-        proxies = None
-        if proxy_url:
-            proxies = {
-                "http": proxy_url,
-                "https": proxy_url,
-            }
-            logger.info(f"Using proxy: {proxy_url}")
-        summary_response = requests.get(f"{STATUS_PAGE_API_URL}/v2/summary.json", proxies=proxies)
-        summary_response.raise_for_status()
-        summary_data = summary_response.json()
+        # Connections are pooled per proxy and kept alive for the other requests of the process
+        pool = ConnectionPool.manager()
+        if proxy and proxy.url:
+            pool = ConnectionPool.manager(proxy.url, proxy.username, proxy.password)
+            logger.info(f"Using proxy: {proxy.url}")
+        url = f"{STATUS_PAGE_API_URL}/v2/summary.json"
+        # Conditional request: an unchanged summary is answered with a 304 and read from the cache
+        entry = None
+        if response_cache:
+            try:
+                entry = response_cache.get(url)
+            except Exception as e:
+                logger.warning(f"Failed to read the response cache: {e}")
+        summary_response = pool.request("GET", url, headers=ResponseCache.conditional_headers(entry))
+        if summary_response.status == 304 and entry:
+            logger.debug("Status page summary not modified, using the cached one")
+            return json.loads(entry["data"])
+        if summary_response.status >= 400:
+            raise urllib3.exceptions.HTTPError(f"Unexpected status: {summary_response.status}")
+        summary_data = json.loads(summary_response.data)
+
+        etag = summary_response.headers.get("ETag")
+        last_modified = summary_response.headers.get("Last-Modified")
+        if response_cache and (etag or last_modified):
+            try:
+                response_cache.set(url, etag, last_modified, summary_response.data)
+            except Exception as e:
+                logger.warning(f"Failed to update the response cache: {e}")
 
         return summary_data
     except Exception as e:
@@ -64,27 +72,8 @@ def stream_events(inputs: smi.InputDefinition, event_writer: smi.EventWriter):
             )
 
             # Setup logging
-            log_level = conf_manager.get_log_level(
-                logger=logger,
-                session_key=session_key,
-                app_name=ADDON_NAME,
-                conf_name="genesys_cloud_ta_settings",
-            )
-            logger.setLevel(log_level)
-            try:
-                proxy_config = conf_manager.get_proxy_dict(
-                    logger=logger,
-                    session_key=session_key,
-                    app_name=ADDON_NAME,
-                    conf_name="genesys_cloud_ta_settings",
-                )
-            # Handle invalid port case
-            except InvalidPortError as e:
-                logger.error(f"Proxy configuration error: {e}")
-
-            # Handle invalid hostname case
-            except InvalidHostnameError as e:
-                logger.error(f"Proxy configuration error: {e}")
+            logger.setLevel(ConfigCache.get_log_level(logger, session_key))
+            proxy_config = ConfigCache.get_proxy_dict(logger, session_key)
             log.modular_input_start(logger, normalized_input_name)
 
             # Get checkpoints for incidents
@@ -99,7 +88,7 @@ def stream_events(inputs: smi.InputDefinition, event_writer: smi.EventWriter):
 
             proxy = ProxyHandler(logger, proxy_config)
             # Fetch data from Status Page API
-            summary = fetch_status_page_data(logger, proxy_url=proxy.get_url_w_auth())
+            summary = fetch_status_page_data(logger, proxy=proxy, response_cache=ResponseCache(logger))
 
             # Process summary data
             sourcetype = "genesyscloud:operational:system"
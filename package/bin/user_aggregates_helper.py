@@ -2,31 +2,73 @@ import json
 import logging
 
 import import_declare_test
-from solnlib import conf_manager, log
+from solnlib import log
 from solnlib.modular_input import checkpointer
-from solnlib.conf_manager import InvalidHostnameError, InvalidPortError
 from splunklib import modularinput as smi
-from datetime import datetime, timezone
+from datetime import datetime, timezone, timedelta
 from dateutil.relativedelta import relativedelta
+from typing import Iterator, List, Optional, Tuple
 
+from genesyscloud_backfill import BackfillCheckpoint, Window, format_interval, parse_interval, split_days
 from genesyscloud_client import GenesysCloudClient
+from genesyscloud_cache import ConfigCache, EntityCache, ResponseCache, TokenCache
 from genesyscloud_models import UserModel
 
 
 ADDON_NAME = "genesys_cloud_ta"
+# Whole days of the interval are queried by windows of this many days, partial days on their own
+WINDOW_DAYS = 31
+METRICS = [
+    "tAgentRoutingStatus",
+    "tOrganizationPresence",
+    "tSystemPresence"
+]
 
 def logger_for_input(input_name: str) -> logging.Logger:
     return log.Logs().get_logger(f"{ADDON_NAME.lower()}_{input_name}")
 
-def get_account_property(session_key: str, account_name: str, property_name: str):
-
-    cfm = conf_manager.ConfManager(
-        session_key,
-        ADDON_NAME,
-        realm=f"__REST_CREDENTIAL__#{ADDON_NAME}#configs/conf-genesys_cloud_ta_account",
-    )
-    account_conf_file = cfm.get_conf("genesys_cloud_ta_account")
-    return account_conf_file.get(account_name).get(property_name)
+def window_granularity(window: Window) -> Optional[str]:
+    """
+    Pick the granularity of a window, see split_days.
+    :param window: Tuple (start, end).
+    :return: P1D for whole days, PT1H for partial days of an hour or more,
+        None for shorter windows (e.g. follow-up runs), which make a single bucket.
+    """
+    start, end = window
+    if start.time() == end.time() == datetime.min.time():
+        return "P1D"
+    if end - start >= timedelta(hours=1):
+        return "PT1H"
+    return None
+
+def plan_queries(windows: List[Window], user_batches: List[List[str]]) -> Iterator[Tuple[Window, dict]]:
+    """
+    Build the queries of every window for every batch of users.
+    :param windows: Windows of the interval.
+    :param user_batches: Batches of user IDs.
+    :return: Iterator over tuples (window, query body), window by window.
+    """
+    for window in windows:
+        granularity = window_granularity(window)
+        for user_ids in user_batches:
+            body = {
+                "interval": format_interval(window),
+                "group_by": ["userId"],
+                "metrics": METRICS,
+                "filter": {
+                    "type": "or",
+                    "predicates": [
+                        {
+                            "dimension": "userId",
+                            "operator": "matches",
+                            "value": uid
+                        } for uid in user_ids
+                    ]
+                }
+            }
+            if granularity:
+                body["granularity"] = granularity
+            yield window, body
 
 def validate_input(definition: smi.ValidationDefinition):
     return
@@ -43,36 +85,24 @@ def stream_events(inputs: smi.InputDefinition, event_writer: smi.EventWriter):
                 session_key,
                 ADDON_NAME,
             )
-            log_level = conf_manager.get_log_level(
-                logger=logger,
-                session_key=session_key,
-                app_name=ADDON_NAME,
-                conf_name="genesys_cloud_ta_settings",
-            )
-            logger.setLevel(log_level)
-            try:
-                proxy_config = conf_manager.get_proxy_dict(
-                    logger=logger,
-                    session_key=session_key,
-                    app_name=ADDON_NAME,
-                    conf_name="genesys_cloud_ta_settings",
-                )
-            # Handle invalid port case
-            except InvalidPortError as e:
-                logger.error(f"Proxy configuration error: {e}")
-
-            # Handle invalid hostname case
-            except InvalidHostnameError as e:
-                logger.error(f"Proxy configuration error: {e}")
+            logger.setLevel(ConfigCache.get_log_level(logger, session_key))
+            proxy_config = ConfigCache.get_proxy_dict(logger, session_key)
             log.modular_input_start(logger, normalized_input_name)
 
-            client_id = get_account_property(session_key, input_item.get("account"), "client_id")
-            client_secret = get_account_property(session_key, input_item.get("account"), "client_secret")
-            account_region = get_account_property(session_key, input_item.get("account"), "region")
+            account_config = ConfigCache.get_account(session_key, input_item.get("account"))
+            client_id = account_config.get("client_id")
+            client_secret = account_config.get("client_secret")
+            account_region = account_config.get("region")
+            max_concurrency = account_config.get("max_concurrency")
 
             # Initialize Genesys Cloud client
             client = GenesysCloudClient(
-                logger, client_id, client_secret, account_region, proxy_config
+                logger, client_id, client_secret, account_region, proxy_config, max_concurrency,
+                token_cache=TokenCache(logger, session_key),
+                response_cache=ResponseCache(logger)
+            )
+            entity_cache = EntityCache(
+                logger, input_item.get("account"), account_config.get("inventory_cache_ttl")
             )
 
             # Initialize checkpointing
@@ -87,8 +117,8 @@ def stream_events(inputs: smi.InputDefinition, event_writer: smi.EventWriter):
 
             # Getting data from API
             logger.info("Getting data from users endpoint")
-            user_model = UserModel(
-                client.get("UsersApi", "get_users")
+            user_model = entity_cache.load(
+                UserModel, "users", lambda: client.iter_get("UsersApi", "get_users")
             )
 
             # Getting metrics
@@ -96,64 +126,64 @@ def stream_events(inputs: smi.InputDefinition, event_writer: smi.EventWriter):
             logger.debug(f"Range interval: {interval}")
 
             # Max 100 userids supported according to specs (??)
-            results = []
+            user_batches = []
             cnt = 0
             has_more = True
             while has_more:
                 user_ids, has_more = user_model.get_user_ids(cnt)
-                body = {
-                    "interval": interval,
-                    "granularity": "P1D",
-                    "groupBy": ["userId"],
-                    "metrics": [
-                        "tAgentRoutingStatus",
-                        "tOrganizationPresence",
-                        "tSystemPresence"
-                    ],
-                    "filter": {
-                        "type": "or",
-                        "predicates": [
-                            {
-                                "dimension": "userId",
-                                "operator": "matches",
-                                "value": uid
-                            } for uid in user_ids
-                        ]
-                    }
-                }
-                data = client.post(
-                    "UsersApi",
-                    "post_analytics_users_aggregates_query",
-                    "UserAggregationQuery",
-                    body
-                )
-                if data:
-                    res_dict = data.to_dict() or {}
-                    results.extend(res_dict.get("results", []) or [])
+                user_batches.append(user_ids)
                 cnt+=1
-            logger.debug(f"Fetched '{len(results)}' user aggregates")
+
+            # The interval is queried by windows, each of them for every batch of users concurrently.
+            # Windows are checkpointed once all their batches are written, so that an interrupted
+            # first run resumes with the windows not collected yet.
+            backfill = BackfillCheckpoint(
+                logger, kvstore_checkpointer, f"{checkpointer_key_name}_backfill", parse_interval(interval)
+            )
+            windows = backfill.remaining(split_days(backfill.window, WINDOW_DAYS))
+            logger.info(f"Querying {len(windows)} windows for {len(user_batches)} batches of users")
+            pending = {window: len(user_batches) for window in windows}
+            window_events = {window: 0 for window in windows}
+            current_end = parse_interval(interval)[1]
+            results = client.iter_post_many(
+                "UsersApi",
+                "post_analytics_users_aggregates_query",
+                "UserAggregationQuery",
+                plan_queries(windows, user_batches),
+                "results"
+            )
 
             sourcetype = "genesyscloud:users:users:aggregates"
             event_counter = 0
-            for item in results:
-                for data_entry in item["data"]:
-                    for metrics in data_entry["metrics"]:
-                        metrics["user"] = user_model.get_user(item["group"]["userId"])
-                        metrics["interval"] = data_entry["interval"]
-                        event_writer.write_event(
-                            smi.Event(
-                                data=json.dumps(metrics, ensure_ascii=False, default=str),
-                                index=input_item.get("index"),
-                                sourcetype=sourcetype
+            for window, items in results:
+                for item in items:
+                    for data_entry in item["data"]:
+                        for metrics in data_entry["metrics"]:
+                            metrics["user"] = user_model.get_user(item["group"]["userId"])
+                            metrics["interval"] = data_entry["interval"]
+                            event_writer.write_event(
+                                smi.Event(
+                                    data=json.dumps(metrics, ensure_ascii=False, default=str),
+                                    index=input_item.get("index"),
+                                    sourcetype=sourcetype
+                                )
                             )
-                        )
-                        event_counter += 1
-
-            # Updating checkpoint if data was indexed to avoid losing info
-            if event_counter > 0:
-                logger.debug(f"Indexed '{event_counter}' events")
+                            event_counter += 1
+                            window_events[window] += 1
+                pending[window] -= 1
+                # The window ending now is not closed yet: it is only checkpointed if data was indexed,
+                # otherwise the next run queries it again
+                if not pending[window] and (window[1] < current_end or window_events[window] > 0):
+                    backfill.complete(window)
+
+            # The checkpoint moves to the end of the interval once all its windows are collected,
+            # possibly over several runs
+            logger.debug(f"Indexed '{event_counter}' events")
+            if backfill.collected():
+                new_checkpoint = backfill.window[1].strftime("%Y-%m-%dT%H:%M:%SZ")
                 logger.debug(f"Updating checkpointer to {new_checkpoint}")
                 kvstore_checkpointer.update(checkpointer_key_name, new_checkpoint)
+                backfill.finish()
 
             log.events_ingested(
                 logger,
@@ -2,31 +2,22 @@ import json
 import logging
 
 import import_declare_test
-from solnlib import conf_manager, log
-from solnlib.conf_manager import InvalidHostnameError, InvalidPortError
+from solnlib import log
 from solnlib.modular_input import checkpointer
 from splunklib import modularinput as smi
 
 from datetime import datetime, timezone
 from genesyscloud_client import GenesysCloudClient
-from genesyscloud_models import UserModel
+from genesyscloud_cache import ConfigCache, TokenCache
 
 
 ADDON_NAME = "genesys_cloud_ta"
+# Max page size accepted when expanding the users routing status
+USERS_PAGE_SIZE = 100
 
 def logger_for_input(input_name: str) -> logging.Logger:
     return log.Logs().get_logger(f"{ADDON_NAME.lower()}_{input_name}")
 
-def get_account_property(session_key: str, account_name: str, property_name: str):
-
-    cfm = conf_manager.ConfManager(
-        session_key,
-        ADDON_NAME,
-        realm=f"__REST_CREDENTIAL__#{ADDON_NAME}#configs/conf-genesys_cloud_ta_account",
-    )
-    account_conf_file = cfm.get_conf("genesys_cloud_ta_account")
-    return account_conf_file.get(account_name).get(property_name)
-
 def validate_input(definition: smi.ValidationDefinition):
     return
 
@@ -41,36 +32,20 @@ def stream_events(inputs: smi.InputDefinition, event_writer: smi.EventWriter):
                 session_key,
                 ADDON_NAME,
             )
-            log_level = conf_manager.get_log_level(
-                logger=logger,
-                session_key=session_key,
-                app_name=ADDON_NAME,
-                conf_name="genesys_cloud_ta_settings",
-            )
-            logger.setLevel(log_level)
-            try:
-                proxy_config = conf_manager.get_proxy_dict(
-                    logger=logger,
-                    session_key=session_key,
-                    app_name=ADDON_NAME,
-                    conf_name="genesys_cloud_ta_settings",
-                )
-            # Handle invalid port case
-            except InvalidPortError as e:
-                logger.error(f"Proxy configuration error: {e}")
-
-            # Handle invalid hostname case
-            except InvalidHostnameError as e:
-                logger.error(f"Proxy configuration error: {e}")
+            logger.setLevel(ConfigCache.get_log_level(logger, session_key))
+            proxy_config = ConfigCache.get_proxy_dict(logger, session_key)
             log.modular_input_start(logger, normalized_input_name)
 
-            client_id = get_account_property(session_key, input_item.get("account"), "client_id")
-            client_secret = get_account_property(session_key, input_item.get("account"), "client_secret")
-            account_region = get_account_property(session_key, input_item.get("account"), "region")
+            account_config = ConfigCache.get_account(session_key, input_item.get("account"))
+            client_id = account_config.get("client_id")
+            client_secret = account_config.get("client_secret")
+            account_region = account_config.get("region")
+            max_concurrency = account_config.get("max_concurrency")
 
             # Initialize Genesys Cloud client
             client = GenesysCloudClient(
-                logger, client_id, client_secret, account_region, proxy_config
+                logger, client_id, client_secret, account_region, proxy_config, max_concurrency,
+                token_cache=TokenCache(logger, session_key)
             )
 
             # Initialize checkpointing
@@ -81,26 +56,27 @@ def stream_events(inputs: smi.InputDefinition, event_writer: smi.EventWriter):
                 or datetime(1970, 1, 1).timestamp()
             )
 
-            # Getting user ids from API
+            # Getting users along with their routing status.
+            # One request per page of users instead of one request per user.
             logger.info("Getting data from users endpoint")
-            user_model = UserModel(
-                client.get("UsersApi", "get_users")
+            users = client.iter_get(
+                "UsersApi",
+                "get_users",
+                page_size=USERS_PAGE_SIZE,
+                expand=["routingStatus"]
             )
 
-            # Getting user routing status
             sourcetype = "genesyscloud:users:users:routingstatus"
             rcounter = 0
-            # CAREFUL! 300+ users = 300+ API calls. Most likely hit rate limits.
-            for uid in user_model.user_ids:
-                response = client.get("UsersApi", "get_user_routingstatus", uid)
-
-                if response and response[0].start_time:
-                    event_time_epoch = response[0].start_time.timestamp()
+            for user in users:
+                routing_status = user.routing_status
+                if routing_status and routing_status.start_time:
+                    event_time_epoch = routing_status.start_time.timestamp()
 
                     if event_time_epoch > current_checkpoint:
-                        routing = response[0].to_dict()
+                        routing = routing_status.to_dict()
                         routing["start_time"] = event_time_epoch
-                        routing['user_id'] = uid
+                        routing['user_id'] = user.id
                         event_writer.write_event(
                             smi.Event(
                                 data=json.dumps(routing, ensure_ascii=False, default=str),
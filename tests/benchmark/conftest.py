@@ -0,0 +1,36 @@
+import gc
+import logging
+import os
+import sys
+import time
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../package/bin")))
+
+logging.basicConfig(filename="conftest.log", level=logging.DEBUG)
+LOGGER = logging.getLogger()
+
+LOGGER.info("Conftest [benchmark] - Entering")
+
+
+@pytest.fixture(scope="session")
+def best_time():
+    def _best_time(func, repeat: int = 3):
+        """
+        Time func with the garbage collector paused, as timeit does.
+        :return: Tuple (best elapsed time in seconds, result of the last run).
+        """
+        best = None
+        for _ in range(repeat):
+            gc.collect()
+            gc.disable()
+            try:
+                start = time.perf_counter()
+                result = func()
+                elapsed = time.perf_counter() - start
+            finally:
+                gc.enable()
+            best = elapsed if best is None else min(best, elapsed)
+        return best, result
+    return _best_time
+
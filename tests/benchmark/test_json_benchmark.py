@@ -0,0 +1,19 @@
+import json
+
+
+RECORD_COUNT = 20000
+CHUNK_SIZE = 8192
+
+
+def test_pass_through_vs_reencoding(audit_records_factory, split_payload, best_time):
+    """Time writing records as received against parsing and re-encoding them"""
+    payload = json.dumps(audit_records_factory(RECORD_COUNT)).encode()
+
+    reencoded_elapsed, reencoded = best_time(
+        lambda: [json.dumps(record, ensure_ascii=False, default=str) for record in json.loads(payload)]
+    )
+    passed_through_elapsed, passed_through = best_time(lambda: split_payload(payload, CHUNK_SIZE))
+
+    print(f"{RECORD_COUNT} records: re-encoding {reencoded_elapsed:.4f}s, pass-through {passed_through_elapsed:.4f}s")
+    assert len(passed_through) == len(reencoded) == RECORD_COUNT
+    assert passed_through_elapsed < reencoded_elapsed
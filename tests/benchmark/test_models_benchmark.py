@@ -0,0 +1,100 @@
+import json
+import time
+import pytest
+
+from genesyscloud_models import EdgeModel, PhoneModel, QueueModel, TrunkModel, UserModel
+
+
+# Metric rows enriched per entity, e.g. intervals x metrics in user_aggregates
+ROWS_PER_ENTITY = 10
+SMALL_COUNT = 500
+LARGE_COUNT = 4000
+CONVERSION_COUNT = 10000
+PHONE_COUNT = 20000
+
+
+def measure_enrichment(model, getter_name: str, repeat: int = 3) -> float:
+    """
+    Time the enrichment of ROWS_PER_ENTITY rows per entity, as the helpers do once per emitted metric.
+    :return: Best elapsed time in seconds.
+    """
+    getter = getattr(model, getter_name)
+    ids = model.ids
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(ROWS_PER_ENTITY):
+            for entity_id in ids:
+                getter(entity_id)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+@pytest.mark.parametrize("model_class, factory_name, getter_name",
+    [
+        (UserModel, "users_factory", "get_user"),
+        (QueueModel, "queues_factory", "get_queue"),
+        (EdgeModel, "edges_factory", "get_edge"),
+        (TrunkModel, "trunks_factory", "get_trunk"),
+    ],
+)
+def test_enrichment_scaling(request, model_class, factory_name, getter_name):
+    """Time the enrichment for a small and a large number of entities: it should grow linearly"""
+    factory = request.getfixturevalue(factory_name)
+    small = measure_enrichment(model_class(factory(SMALL_COUNT)), getter_name)
+    large = measure_enrichment(model_class(factory(LARGE_COUNT)), getter_name)
+
+    # Linear enrichment grows by LARGE_COUNT / SMALL_COUNT, a quadratic one by its square
+    print(f"{model_class.__name__}: {SMALL_COUNT} -> {small:.4f}s, {LARGE_COUNT} -> {large:.4f}s (x{large / small:.1f})")
+    # Loose bound, timings of small runs are noisy: well below quadratic growth
+    growth = LARGE_COUNT / SMALL_COUNT
+    assert large / small < growth * 4
+
+
+def user_conversion(users) -> tuple:
+    """
+    :return: Tuple (converting every user with to_dict(), projecting the required keys).
+    """
+    def convert():
+        converted = [user.to_dict() for user in users]
+        return [{k: user[k] for k in UserModel.REQUIRED_KEYS if k in user} for user in converted]
+
+    def project():
+        model = UserModel(users)
+        return [model.get_user(uid) for uid in model.user_ids]
+
+    return convert, project
+
+
+def phone_emission(phones) -> tuple:
+    """
+    :return: Tuple (serializing every status, serializing the statuses changed since a previous run).
+    """
+    digests = {}
+    list(PhoneModel.iter_changed_statuses(phones, {}, digests, 0))
+
+    def full():
+        return [json.dumps(s, default=str) for s in PhoneModel.iter_extended_statuses(phones)]
+
+    def delta():
+        return [json.dumps(s, default=str) for s in PhoneModel.iter_changed_statuses(phones, digests, {}, 0)]
+
+    return full, delta
+
+
+@pytest.mark.parametrize("factory_name, count, build",
+    [
+        ("users_factory", CONVERSION_COUNT, user_conversion),
+        ("phones_factory", PHONE_COUNT, phone_emission),
+    ],
+)
+def test_optimized_vs_baseline(request, best_time, factory_name, count, build):
+    """Time the optimized processing of a model against the processing it replaced"""
+    baseline, optimized = build(request.getfixturevalue(factory_name)(count))
+
+    baseline_elapsed, _ = best_time(baseline)
+    optimized_elapsed, _ = best_time(optimized)
+
+    print(f"{build.__name__} x{count}: baseline {baseline_elapsed:.4f}s, optimized {optimized_elapsed:.4f}s")
+    assert optimized_elapsed < baseline_elapsed
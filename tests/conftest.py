@@ -1,5 +1,20 @@
 import pytest
 import logging
+import uuid
+
+from PureCloudPlatformClientV2.models import (
+    Contact,
+    Division,
+    DomainEntityRef,
+    Edge,
+    LineStatus,
+    Phone,
+    PhoneStatus,
+    Queue,
+    Site,
+    Trunk,
+    User
+)
 
 logging.basicConfig(filename="conftest.log", level=logging.DEBUG)
 LOGGER = logging.getLogger()
@@ -33,4 +48,107 @@ def pytest_addoption(parser):
         dest="aws_region",
         help="The AWS Region Genesys Cloud runs in, defaults to localhost:3004",
         default="localhost:3004"
-    )
\ No newline at end of file
+    )
+
+
+def entities_factory(build):
+    """
+    Declare a fixture returning a factory of entities as returned by the SDK, e.g. users_factory(2000)
+    :param build: Function building the entity of a given index.
+    """
+    @pytest.fixture(scope="session")
+    def _entities_factory():
+        return lambda count: [build(i) for i in range(count)]
+    return _entities_factory
+
+
+def _model(model_class, **fields):
+    model = model_class()
+    for name, value in fields.items():
+        setattr(model, name, value)
+    return model
+
+
+def _ref(model_class, name: str):
+    return _model(model_class, id=str(uuid.uuid4()), name=name)
+
+
+def _user(i: int) -> User:
+    email = f"user{i}@example.com"
+    return _model(
+        User, id=str(uuid.uuid4()), name=f"User {i}", email=email, state="active", division=_ref(Division, "Home"),
+        # Fields the enrichments do not use, as returned by the users API
+        department="Support", title="Agent", username=email, version=1,
+        primary_contact_info=[_model(Contact, address=email, media_type="EMAIL", type="PRIMARY")],
+        addresses=[_model(Contact, address=f"+1555000{i:04d}", media_type="PHONE", type="WORK")]
+    )
+
+
+def _audit_record(i: int) -> dict:
+    return {
+        "id": str(uuid.uuid4()),
+        "user": {"id": str(uuid.uuid4()), "name": f"User {i}"},
+        "serviceName": "Architect",
+        "level": "USER",
+        "eventTime": "2024-01-01T00:00:00Z",
+        "action": "Update",
+        "entity": {"id": str(uuid.uuid4()), "name": "Flow \"main\" [v2]"},
+        "entityType": "Flow",
+        "propertyChanges": [{"property": "name", "oldValues": ["a"], "newValues": ["b"]}],
+        "message": {"message": "Flow updated", "messageParams": {}},
+    }
+
+
+def _phone_status(status_id: str) -> PhoneStatus:
+    line_status = _model(
+        LineStatus, id=str(uuid.uuid4()), reachable=True, address_of_record=f"sip:{status_id}@example.com"
+    )
+    return _model(
+        PhoneStatus, id=status_id, operational_status="OPERATIONAL", edges_status="IN_SERVICE",
+        event_creation_time="2025-01-01T00:00:00.000Z", line_statuses=[line_status], edge=_ref(DomainEntityRef, "Edge")
+    )
+
+
+def _phone(i: int) -> Phone:
+    phone_id = str(uuid.uuid4())
+    return _model(
+        Phone, id=phone_id, name=f"Phone {i}", state="active", site=_ref(Site, "Site"),
+        status=_phone_status(phone_id), secondary_status=_phone_status(phone_id)
+    )
+
+
+users_factory = entities_factory(_user)
+queues_factory = entities_factory(
+    lambda i: _model(Queue, id=str(uuid.uuid4()), name=f"Queue {i}", division=_ref(Division, "Home"))
+)
+edges_factory = entities_factory(
+    lambda i: _model(
+        Edge, id=str(uuid.uuid4()), name=f"Edge {i}", state="active", online_status="ONLINE", site=_ref(Site, "Site")
+    )
+)
+trunks_factory = entities_factory(
+    lambda i: _model(
+        Trunk, id=str(uuid.uuid4()), name=f"Trunk {i}", state="active", trunk_type="EXTERNAL",
+        edge=_ref(DomainEntityRef, "Edge")
+    )
+)
+phones_factory = entities_factory(_phone)
+audit_records_factory = entities_factory(_audit_record)
+
+
+@pytest.fixture(scope="session")
+def split_payload():
+    """
+    Split a downloaded JSON array into records fed by chunks, as GenesysCloudClient does, e.g. split_payload(payload, 8192)
+    """
+    # Imported here, package/bin is added to the path by the conftest of the test directories
+    from genesyscloud_client import JsonArraySplitter
+
+    def _split_payload(payload: bytes, chunk_size: int) -> list:
+        splitter = JsonArraySplitter()
+        records = []
+        for i in range(0, len(payload), chunk_size):
+            records.extend(splitter.feed(payload[i:i + chunk_size]))
+        records.extend(splitter.close())
+        return records
+    return _split_payload
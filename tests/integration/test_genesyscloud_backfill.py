@@ -0,0 +1,120 @@
+import logging
+
+from datetime import timedelta
+from genesyscloud_backfill import (
+    BackfillCheckpoint, format_interval, parse_interval, split_days, split_evenly, split_interval, subtract
+)
+
+
+LOGGER = logging.getLogger()
+INTERVAL = "2025-01-01T00:00:00Z/2025-01-08T12:00:00Z"
+
+
+class DictCheckpointer(dict):
+    """In-memory stand-in for the KVStoreCheckpointer interface"""
+    def update(self, key, state):
+        self[key] = state
+
+    def delete(self, key):
+        self.pop(key, None)
+
+
+def intervals(windows) -> list:
+    return [format_interval(w) for w in windows]
+
+
+class TestGenesysCloudBackfill:
+    """Test Class for the backfill windows and their checkpoint"""
+
+
+    def test_windows_cover_the_interval(self):
+        """Test slices and even splits cover the interval without gaps or overlaps"""
+        window = parse_interval(INTERVAL)
+        days = split_interval(window, timedelta(days=1))
+        assert len(days) == 8
+        assert intervals(days[-1:]) == ["2025-01-08T00:00:00Z/2025-01-08T12:00:00Z"]
+
+        parts = split_evenly(days[0], 3)
+        assert intervals(parts) == [
+            "2025-01-01T00:00:00Z/2025-01-01T08:00:00Z",
+            "2025-01-01T08:00:00Z/2025-01-01T16:00:00Z",
+            "2025-01-01T16:00:00Z/2025-01-02T00:00:00Z",
+        ]
+        # Windows are not split below the minimum duration
+        assert len(split_evenly(days[0], 10000, timedelta(minutes=1))) == 24 * 60
+        for windows in (days, parts):
+            assert all(a[1] == b[0] for a, b in zip(windows, windows[1:]))
+
+
+    def test_windows_aligned_on_days(self):
+        """Test windows of whole days are cut at UTC midnights, partial days kept apart"""
+        windows = split_days(parse_interval("2025-01-01T10:05:00Z/2025-03-05T10:10:00Z"), 31)
+        assert intervals(windows) == [
+            "2025-01-01T10:05:00Z/2025-01-02T00:00:00Z",
+            "2025-01-02T00:00:00Z/2025-02-02T00:00:00Z",
+            "2025-02-02T00:00:00Z/2025-03-05T00:00:00Z",
+            "2025-03-05T00:00:00Z/2025-03-05T10:10:00Z",
+        ]
+        # Follow-up runs: a single window, unless they cross midnight
+        assert intervals(split_days(parse_interval("2025-01-01T10:00:00Z/2025-01-01T10:05:00Z"), 31)) == [
+            "2025-01-01T10:00:00Z/2025-01-01T10:05:00Z"
+        ]
+        assert len(split_days(parse_interval("2025-01-01T23:58:00Z/2025-01-02T00:03:00Z"), 31)) == 2
+        # Four years, as the first run of user aggregates
+        window = parse_interval("2021-10-18T10:05:00Z/2025-10-18T10:05:00Z")
+        windows = split_days(window, 31)
+        assert len(windows) == 50
+        assert windows[0][0] == window[0] and windows[-1][1] == window[1]
+        assert all(a[1] == b[0] for a, b in zip(windows, windows[1:]))
+
+
+    def test_subtract(self):
+        """Test collected windows are removed, partially collected ones trimmed"""
+        window = parse_interval(INTERVAL)
+        days = split_interval(window, timedelta(days=1))
+        done = [days[1], split_evenly(days[3], 2)[0], days[7]]
+        assert intervals(subtract(days[:5], done)) == [
+            "2025-01-01T00:00:00Z/2025-01-02T00:00:00Z",
+            "2025-01-03T00:00:00Z/2025-01-04T00:00:00Z",
+            "2025-01-04T12:00:00Z/2025-01-05T00:00:00Z",
+            "2025-01-05T00:00:00Z/2025-01-06T00:00:00Z",
+        ]
+        assert subtract(days, [window]) == []
+
+
+    def test_interrupted_backfill_resumes(self):
+        """Test a backfill starting at the same checkpoint skips the windows already collected"""
+        window = parse_interval(INTERVAL)
+        checkpointer = DictCheckpointer()
+        backfill = BackfillCheckpoint(LOGGER, checkpointer, "input_backfill", window)
+        days = split_interval(window, timedelta(days=1))
+        for day in (days[2], days[0], days[1]):
+            backfill.complete(day)
+        # Adjacent windows are stored merged
+        assert checkpointer["input_backfill"]["done"] == ["2025-01-01T00:00:00Z/2025-01-04T00:00:00Z"]
+
+        # Next run: same checkpoint, later end. The interval of the interrupted backfill is resumed.
+        resumed = BackfillCheckpoint(LOGGER, checkpointer, "input_backfill", (window[0], window[1] + timedelta(hours=6)))
+        assert resumed.window == window
+        assert resumed.remaining(split_interval(resumed.window, timedelta(days=1))) == days[3:]
+        resumed.finish()
+        assert "input_backfill" not in checkpointer
+
+        # A backfill of another interval is discarded
+        backfill.complete(days[0])
+        moved = BackfillCheckpoint(LOGGER, checkpointer, "input_backfill", (window[0] + timedelta(hours=1), window[1]))
+        assert moved.done == []
+
+
+    def test_collected(self):
+        """Test the interval is collected only once all its windows are, including the last one"""
+        window = parse_interval(INTERVAL)
+        backfill = BackfillCheckpoint(LOGGER, DictCheckpointer(), "input_backfill", window)
+        days = split_days(window, 31)
+        assert not backfill.collected()
+        for day in days[:-1]:
+            backfill.complete(day)
+        # The current window returned no events and was left out: the input checkpoint does not move
+        assert not backfill.collected()
+        backfill.complete(days[-1])
+        assert backfill.collected()
@@ -0,0 +1,131 @@
+import json
+import logging
+import pytest
+import time
+
+from solnlib.conf_manager import InvalidHostnameError, InvalidPortError
+
+from genesyscloud_cache import ConfigCache, DedupStore, EntityCache, ResponseCache
+from genesyscloud_models import EdgeModel, QueueModel, TrunkModel, UserModel
+
+
+ENTITY_COUNT = 2000
+LOGGER = logging.getLogger()
+
+
+def dumps(value) -> str:
+    # Same serialization as the events written by the helpers
+    return json.dumps(value, ensure_ascii=False, default=str, sort_keys=True)
+
+
+class TestGenesysCloudCache:
+    """Test Class for the SQLite caches"""
+
+
+    @pytest.mark.parametrize("model_class, factory_name, getter_name",
+        [
+            (UserModel, "users_factory", "get_user"),
+            (QueueModel, "queues_factory", "get_queue"),
+            (EdgeModel, "edges_factory", "get_edge"),
+            (TrunkModel, "trunks_factory", "get_trunk"),
+        ],
+    )
+    def test_snapshot_enrichment_unchanged(self, tmp_path, request, model_class, factory_name, getter_name):
+        """Test entities loaded from a snapshot enrich events exactly as the downloaded ones"""
+        entities = request.getfixturevalue(factory_name)(ENTITY_COUNT)
+        cache = EntityCache(LOGGER, "account", path=str(tmp_path / "entity_cache.db"))
+        fetched = cache.load(model_class, "entities", lambda: entities)
+        cached = cache.load(model_class, "entities", lambda: pytest.fail("Inventory downloaded again"))
+
+        assert cached.ids == fetched.ids
+        for entity_id in fetched.ids:
+            assert dumps(getattr(cached, getter_name)(entity_id)) == dumps(getattr(fetched, getter_name)(entity_id))
+
+
+    def test_snapshot_expiration(self, tmp_path, queues_factory):
+        """Test snapshots are per account and downloaded again once expired or when disabled"""
+        path = str(tmp_path / "entity_cache.db")
+        downloads = []
+
+        def fetch():
+            downloads.append(1)
+            return queues_factory(10)
+
+        EntityCache(LOGGER, "account", path=path).load(QueueModel, "queues", fetch)
+        EntityCache(LOGGER, "account", path=path).load(QueueModel, "queues", fetch)
+        assert len(downloads) == 1
+        EntityCache(LOGGER, "other_account", path=path).load(QueueModel, "queues", fetch)
+        assert len(downloads) == 2
+        EntityCache(LOGGER, "account", ttl="0", path=path).load(QueueModel, "queues", fetch)
+        assert len(downloads) == 3
+        EntityCache(LOGGER, "account", ttl=-1, path=path).load(QueueModel, "queues", fetch)
+        assert len(downloads) == 4
+
+
+    def test_response_cache(self, tmp_path):
+        """Test stored responses are returned as stored, with the validators of the conditional request"""
+        cache = ResponseCache(LOGGER, path=str(tmp_path / "response_cache.db"))
+        assert cache.get("key") is None
+        assert ResponseCache.conditional_headers(cache.get("key")) == {}
+
+        cache.set("key", '"v1"', None, '{"entities": []}')
+        cache.set("bytes", None, "Wed, 01 Jan 2025 00:00:00 GMT", b'{"page": {}}')
+        assert cache.get("key")["data"] == '{"entities": []}'
+        assert cache.get("bytes")["data"] == b'{"page": {}}'
+        assert ResponseCache.conditional_headers(cache.get("key")) == {"If-None-Match": '"v1"'}
+        assert ResponseCache.conditional_headers(cache.get("bytes")) == {
+            "If-Modified-Since": "Wed, 01 Jan 2025 00:00:00 GMT"
+        }
+
+
+    def test_response_cache_prune(self, tmp_path):
+        """Test responses not stored again within max_age are dropped on the next store"""
+        path = str(tmp_path / "response_cache.db")
+        ResponseCache(LOGGER, max_age=0.05, path=path).set("old", '"v1"', None, "{}")
+        time.sleep(0.1)
+        cache = ResponseCache(LOGGER, max_age=0.05, path=path)
+        assert cache.get("old") is not None
+        cache.set("new", '"v1"', None, "{}")
+        assert cache.get("old") is None
+        assert cache.get("new") is not None
+
+
+    def test_dedup_store(self, tmp_path):
+        """Test records collected again are selected only once changed, and only the most recent ones are kept"""
+        path = str(tmp_path / "dedup.db")
+        dedup = DedupStore(LOGGER, "input", max_entries=ENTITY_COUNT, path=path)
+        versions = {f"c{i}": None for i in range(ENTITY_COUNT)}
+        assert dedup.changed(versions) == set(versions)
+        dedup.add(versions)
+
+        # Overlap of the next run: conversations ended since are selected again, the others skipped
+        versions.update({"c1": "2025-01-01T00:01:00.000Z", f"c{ENTITY_COUNT}": None})
+        assert dedup.changed(versions) == {"c1", f"c{ENTITY_COUNT}"}
+        assert DedupStore(LOGGER, "other_input", path=path).changed({"c1": None}) == {"c1"}
+
+        dedup.add(versions)
+        dedup.prune()
+        # Beyond max_entries, the records seen least recently are dropped
+        assert dedup.changed({"c0": None, "c1": "2025-01-01T00:01:00.000Z", f"c{ENTITY_COUNT}": None}) == {"c0"}
+
+
+    @pytest.mark.parametrize("proxy_url, proxy_port, error",
+        [
+            ("proxy.example.com", "3128", None),
+            ("10.0.0.1", "8080", None),
+            ("", "3128", InvalidHostnameError),
+            ("bad host", "3128", InvalidHostnameError),
+            ("proxy.example.com", "0", InvalidPortError),
+            ("proxy.example.com", "65536", InvalidPortError),
+            ("proxy.example.com", None, InvalidPortError),
+        ],
+    )
+    def test_proxy_validation(self, caplog, proxy_url, proxy_port, error):
+        """Test invalid proxy hosts and ports are logged and rejected as by solnlib"""
+        proxy = {"proxy_enabled": "1", "proxy_url": proxy_url, "proxy_port": proxy_port}
+        if error is None:
+            ConfigCache.validate_proxy(LOGGER, proxy)
+            return
+        with pytest.raises(error):
+            ConfigCache.validate_proxy(LOGGER, proxy)
+        assert "Proxy configuration error" in caplog.text
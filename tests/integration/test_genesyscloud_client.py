@@ -1,7 +1,17 @@
+import json
+import logging
 import pytest
 import uuid
 
 from .GenesysCloudTATest import GenesysCloudTATest
+from genesyscloud_cache import ResponseCache
+from genesyscloud_client import ConditionalHttpClient, GenesysCloudClient, JsonArraySplitter, JsonRecord
+from PureCloudPlatformClientV2.api_client import HttpRequestOptions
+
+
+LOGGER = logging.getLogger()
+RECORD_COUNT = 20000
+CHUNK_SIZE = 8192
 
 
 class TestGenesysCloudClient(GenesysCloudTATest):
@@ -26,6 +36,104 @@ class TestGenesysCloudClient(GenesysCloudTATest):
         assert len(response) == expected_result
 
 
+    @pytest.mark.parametrize("api_name, func_name, expected_result",
+        [
+            ("TelephonyProvidersEdgeApi", "get_telephony_providers_edges", 157),
+            ("RoutingApi", "get_routing_queues", 157),
+            ("UsersApi", "get_users", 358)
+        ],
+    )
+    def test_iter_GET(self, api_name, func_name, expected_result):
+        """Test GET calls streaming entities page by page"""
+
+        response = self.gc_client.iter_get(
+            api_name,
+            func_name
+        )
+        assert not isinstance(response, list)
+        assert len(list(response)) == expected_result
+
+
+    @pytest.mark.parametrize("api_name, func_name",
+        [
+            ("TelephonyProvidersEdgeApi", "get_telephony_providers_edges_trunks_metrics"),
+            ("TelephonyProvidersEdgeApi", "get_telephony_providers_edges_metrics"),
+        ],
+    )
+    def test_GET_many(self, api_name, func_name):
+        """Test GET calls sent concurrently, one per batch of ids"""
+        batches = [(f"{uuid.uuid4()},{uuid.uuid4()}",) for _ in range(3)]
+
+        responses = list(self.gc_client.get_many(api_name, func_name, batches))
+        assert len(responses) == len(batches)
+        assert all(len(response) == 2 for response in responses)
+
+
+    def test_token_cache(self):
+        """Test clients sharing a token cache reuse the cached token"""
+        class DictTokenCache(dict):
+            def set(self, key, access_token, expires_at):
+                self[key] = {"access_token": access_token, "expires_at": expires_at}
+
+        token_cache = DictTokenCache()
+        configs = self.get_genesyscloud_accounts_configuration()
+        first_client = GenesysCloudClient(self.logger, **configs, token_cache=token_cache)
+        second_client = GenesysCloudClient(self.logger, **configs, token_cache=token_cache)
+        assert len(token_cache) == 1
+        assert second_client.client.access_token == first_client.client.access_token
+        assert second_client.token_expires_at == first_client.token_expires_at
+
+
+    def test_wait_for_job(self):
+        """Test polling the status of an asynchronous job until it is done"""
+        response = self.gc_client.post(
+            "AuditApi",
+            "post_audits_query",
+            "AuditQueryRequest",
+            {"interval": "2025-03-17T00:00:00Z/2025-03-24T12:00:00Z"}
+        )
+        status = self.gc_client.wait_for_job(
+            "AuditApi",
+            "get_audits_query_transaction_id",
+            response.id,
+            ("Succeeded", "Failed", "Cancelled"),
+            poll_interval=0.1,
+            backoff=2
+        )
+        assert status.state == "Succeeded"
+
+
+    @pytest.mark.parametrize("raw", [False, True])
+    def test_conversation_details_job(self, raw):
+        """Test collecting conversations through an analytics job: submit, poll, read by cursor, delete"""
+        response = self.gc_client.post(
+            "ConversationsApi",
+            "post_analytics_conversations_details_jobs",
+            "AsyncConversationQuery",
+            {"interval": "2025-03-17T00:00:00Z/2025-03-24T12:00:00Z"}
+        )
+        status = self.gc_client.wait_for_job(
+            "ConversationsApi",
+            "get_analytics_conversations_details_job",
+            response.job_id,
+            ("FULFILLED", "FAILED", "CANCELLED", "EXPIRED"),
+            poll_interval=0.1
+        )
+        assert status.state == "FULFILLED"
+
+        conversations = list(self.gc_client.iter_get(
+            "ConversationsApi",
+            "get_analytics_conversations_details_job_results",
+            response.job_id,
+            raw=raw,
+            items_key="conversations"
+        ))
+        # Both pages of the cursor are read
+        assert len(conversations) == 5
+        assert all((c["conversationId"] if raw else c.conversation_id) for c in conversations)
+        assert self.gc_client.delete("ConversationsApi", "delete_analytics_conversations_details_job", response.job_id)
+
+
     @pytest.mark.parametrize("api_name, func_name, params",
         [
             ("TelephonyProvidersEdgeApi", "get_telephony_providers_edges_phones", dict(expand="site,status")),
@@ -133,6 +241,33 @@ class TestGenesysCloudClient(GenesysCloudTATest):
             assert len(results) == expected_result
 
 
+    def test_iter_POST_conversations(self, body_conversations):
+        """Test POST calls streaming conversations page by page"""
+        response = self.gc_client.iter_post(
+            "ConversationsApi",
+            "post_analytics_conversations_details_query",
+            "ConversationQuery",
+            body_conversations(False, None),
+            "conversations"
+        )
+        assert not isinstance(response, list)
+        assert len(list(response)) == 114
+
+
+    def test_iter_POST_conversations_raw(self, body_conversations):
+        """Test POST calls streaming conversations as raw JSON"""
+        response = list(self.gc_client.iter_post(
+            "ConversationsApi",
+            "post_analytics_conversations_details_query",
+            "ConversationQuery",
+            body_conversations(False, None),
+            "conversations",
+            raw=True
+        ))
+        assert len(response) == 114
+        assert all(isinstance(conversation, dict) and "conversationId" in conversation for conversation in response)
+
+
     @pytest.mark.parametrize("api_name, func_name, model_name",
         [
             ("RoutingApi", "post_analytics_queues_observations_query", "QueueObservationQuery"),
@@ -158,6 +293,20 @@ class TestGenesysCloudClient(GenesysCloudTATest):
         assert len(response.to_dict().get("results", [])) == expected_result
 
 
+    def test_POST_many(self, body_routing_queues):
+        """Test POST calls sent concurrently, one per batch of ids"""
+        bodies = [body_routing_queues([str(uuid.uuid4()), str(uuid.uuid4())]) for _ in range(3)]
+
+        responses = list(self.gc_client.post_many(
+            "RoutingApi",
+            "post_analytics_queues_observations_query",
+            "QueueObservationQuery",
+            bodies
+        ))
+        assert len(responses) == len(bodies)
+        assert all(len(response.to_dict().get("results", [])) == 14 for response in responses)
+
+
     @pytest.mark.parametrize("api_name, func_name, model_name",
         [
             ("RoutingApi", "post_analytics_queues_observations_query", "QueueObservationQuery"),
@@ -178,3 +327,75 @@ class TestGenesysCloudClient(GenesysCloudTATest):
             body
         )
         assert response is None
+
+
+class TestJsonArraySplitter:
+    """Test Class for the splitting of downloaded JSON arrays into records"""
+
+
+    @pytest.mark.parametrize("chunk_size", [1, 7, CHUNK_SIZE])
+    def test_split_records_match_parsed_array(self, audit_records_factory, split_payload, chunk_size):
+        """Test records are split identically whatever the chunk boundaries"""
+        expected = audit_records_factory(20) + [12345, -1.5e10, "text", None, True, [1, [2]]]
+        payload = json.dumps(expected, ensure_ascii=False, indent=2).encode()
+        records = split_payload(payload, chunk_size)
+        assert [json.loads(record) for record in records] == expected
+        assert [record.get("eventTime") for record in records] == [
+            value.get("eventTime") if isinstance(value, dict) else None for value in expected
+        ]
+
+
+    @pytest.mark.parametrize("payload", [b'[1, 2', b'{"id": 1}', b'[1 2]'])
+    def test_split_invalid_array_raises(self, split_payload, payload):
+        """Test truncated or malformed payloads are reported"""
+        with pytest.raises(ValueError):
+            split_payload(payload, CHUNK_SIZE)
+
+
+    def test_split_buffer_is_bounded(self, audit_records_factory):
+        """Test the splitter only buffers the element being received, whatever the array size"""
+        record = json.dumps(audit_records_factory(1)[0]).encode()
+        payload = b"[" + b",".join([record] * RECORD_COUNT) + b"]"
+        splitter = JsonArraySplitter()
+        count = 0
+        largest_buffer = 0
+        for i in range(0, len(payload), CHUNK_SIZE):
+            count += len(splitter.feed(payload[i:i + CHUNK_SIZE]))
+            largest_buffer = max(largest_buffer, len(splitter.text) - splitter.pos)
+        count += len(splitter.close())
+        assert count == RECORD_COUNT
+        assert largest_buffer < len(record) + 1
+
+
+    def test_record_top_level_field(self):
+        """Test top-level fields are read, not the fields of nested objects or strings"""
+        record = JsonRecord(json.dumps({
+            "entity": {"eventTime": "nested"},
+            "message": '"eventTime": "in a string"',
+            "eventTime": "2024-01-01T00:00:00Z",
+        }, indent=2))
+        assert record.get("eventTime") == "2024-01-01T00:00:00Z"
+        assert record.get("entity") == {"eventTime": "nested"}
+        assert record.get("missing") is None
+        assert JsonRecord('["eventTime"]').get("eventTime") is None
+
+
+class TestConditionalHttpClient:
+    """Test Class for the conditional inventory requests"""
+
+
+    @pytest.mark.parametrize("method, path, query_params, expected",
+        [
+            ("GET", "/api/v2/routing/queues", {"pageNumber": 2}, True),
+            ("GET", "/api/v2/users", {"pageSize": 500}, True),
+            ("GET", "/api/v2/users", {"pageSize": 500, "expand": "routingStatus"}, False),
+            ("GET", "/api/v2/users/me", None, False),
+            ("POST", "/api/v2/routing/queues", None, False),
+        ],
+    )
+    def test_conditional_requests(self, tmp_path, method, path, query_params, expected):
+        """Test only inventory GET requests without volatile fields are conditional"""
+        http_client = ConditionalHttpClient(LOGGER, ResponseCache(LOGGER, path=str(tmp_path / "response_cache.db")))
+        options = HttpRequestOptions(url=f"https://api.mypurecloud.com{path}", method=method, query_params=query_params)
+        assert http_client.is_conditional(options) is expected
+        assert ConditionalHttpClient(LOGGER).is_conditional(options) is False
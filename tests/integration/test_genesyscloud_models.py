@@ -0,0 +1,57 @@
+import json
+import pytest
+
+from genesyscloud_models import EdgeModel, PhoneModel, UserModel
+
+
+class TestGenesysCloudModels:
+    """Test Class for the enrichment models"""
+
+
+    def test_lookup_of_unknown_id_raises(self, users_factory):
+        """Test lookups keep raising for ids not in the model"""
+        model = UserModel(users_factory(10))
+        with pytest.raises(ValueError):
+            model.get_user("unknown")
+
+
+    def test_projection_is_shared_and_read_only(self, edges_factory):
+        """Test enrichments reuse one read-only projection per entity"""
+        model = EdgeModel(edges_factory(10))
+        edge_id = model.ids[0]
+        edge = model.get_edge(edge_id)
+        assert model.get_edge(edge_id) is edge
+        with pytest.raises(TypeError):
+            edge["name"] = "changed"
+        with pytest.raises(TypeError):
+            edge["site"]["name"] = "changed"
+        assert json.loads(json.dumps(edge, default=str))["site"] == dict(edge["site"])
+
+
+    def test_projection_matches_full_conversion(self, users_factory):
+        """Test projecting the required keys gives the same enrichment as converting users with to_dict()"""
+        users = users_factory(100)
+        converted = [user.to_dict() for user in users]
+        full = [{k: user[k] for k in UserModel.REQUIRED_KEYS if k in user} for user in converted]
+        model = UserModel(users)
+        projected = [model.get_user(uid) for uid in model.user_ids]
+        assert json.dumps(projected, default=str) == json.dumps(full, default=str)
+
+
+    def test_changed_statuses_only(self, phones_factory):
+        """Test only the statuses whose state changed are emitted once digests are stored"""
+        phones = phones_factory(10)
+        first = {}
+        emitted = list(PhoneModel.iter_changed_statuses(phones, {}, first, 0))
+        assert [json.dumps(s, default=str) for s in emitted] == \
+            [json.dumps(s, default=str) for s in PhoneModel.iter_extended_statuses(phones)]
+        # Without digests, statuses older than the checkpoint are skipped as before
+        assert list(PhoneModel.iter_changed_statuses(phones, {}, {}, 2e9)) == []
+
+        phones[0].status.event_creation_time = "2025-01-02T00:00:00.000Z"
+        phones[1].secondary_status.operational_status = "DEGRADED"
+        second = {}
+        emitted = list(PhoneModel.iter_changed_statuses(phones, first, second, 0))
+        assert [(s["id"], s["operational_status"]) for s in emitted] == [(phones[1].id, "DEGRADED")]
+        assert emitted[0]["name"] == phones[1].name
+        assert list(PhoneModel.iter_changed_statuses(phones, second, {}, 0)) == []